@@ -1,21 +1,26 @@
-import os
-import shutil
-from functools import partial
+from secrets import token_urlsafe
+from shlex import quote
+from time import perf_counter
 
 from makeapp.appconfig import Config, ConfigSetting
-from makeapp.utils import replace_infile, run_command, temp_dir
-
-join = os.path.join  # Short alias
+from makeapp.utils import run_command
 
 
 class WebscaffConfig(Config):
 
-    parent_template = ['pytest']
-
     domain = ConfigSetting(title='Domain Name', default='')
     email = ConfigSetting(title='Admin E-mail')
     host = ConfigSetting(title='Remote Host IP')
 
+    def hook_configure(self):
+        super().hook_configure()
+
+        maker = self.app_template.maker
+
+        if not maker.settings.get('webscaff_secret_key'):
+            # Secure enough to be used in tests etc.
+            maker.update_settings({'webscaff_secret_key': token_urlsafe(50)})
+
     def hook_rollout_init(self):
         super().hook_rollout_init()
 
@@ -39,114 +44,40 @@ class WebscaffConfig(Config):
     def hook_rollout_post(self):
         super().hook_rollout_post()
 
-        package_name = self.app_template.maker.settings['package_name']
-        self.package_name = package_name
-
-        self.dir_project = os.getcwd()
-        self.dir_package_root = join(self.dir_project, package_name)
+        self.package_name = self.app_template.maker.settings['package_name']
 
         # Do things.
         self.prepare_venv()
-        self.prepare_django_files()
-
-        # Install into venv the package itself not to conflict
-        # with Django's `startproject` command.
-        run_command('. venv/bin/activate && pip install -e .')
-
-        # Initialize local sqlite DB.
-        run_command(f'venv/bin/{package_name} makemigrations')
-        run_command(f'venv/bin/{package_name} migrate')
+        self.prepare_db()
 
     def prepare_venv(self):
         self.logger.info('Bootstrapping virtual environment for project ...')
 
-        run_command('python3 -m venv venv/')
-
-        cmd_install = '. venv/bin/activate && pip install -r '
-
-        run_command(cmd_install + 'requirements.txt')
-        run_command(cmd_install + 'tests/requirements.txt')
-
-    def prepare_django_settings_base(self, dir_tmp):
-
-        package_name = self.package_name
-
-        source_file = join(dir_tmp, package_name, 'settings.py')
-
-        replace_infile(
-            source_file,
-            pairs={
-                # Add basic project-related settings.
-                'from pathlib import Path':
+        started = perf_counter()
 
-                    'from pathlib import Path\n\n'
-                    'from .sub_paths import *\n\n',
+        run_command('uv venv -q venv/')
 
-                #  Reset debug.
-                'DEBUG = True':
+        # Single resolution for the project and all the requirements,
+        # packages are taken from uv shared cache when available.
+        run_command(
+            'uv pip install -q --python venv/bin/python '
+            '-r requirements.txt -r tests/requirements.txt -e .')
 
-                    'DEBUG = False\n\n'
-                    "AUTH_USER_MODEL = 'core.User'",
+        self.logger.info(f'Virtual environment is ready in {perf_counter() - started:.1f}s')
 
-                # Secure enough to be used in tests etc.
-                'django-insecure-': '',
+    def prepare_db(self):
+        """Initializes local sqlite DB in one process."""
+        self.logger.info('Initializing local database ...')
 
-                # Add core application.
-                "    'django.contrib.staticfiles',":
-
-                    "    'django.contrib.staticfiles',\n\n"
-                    "    'uwsgiconf.contrib.django.uwsgify',\n\n"
-                    "    '%(module)s.core',\n" % {'module': package_name},
-            })
-
-        shutil.move(source_file, join(self.dir_package_root, 'settings', 'base.py'))
-
-    def prepare_django_files(self):
-        self.logger.info('Bootstrapping Django project and basic application ...')
-
-        dir_package = self.dir_package_root
-        package_name = self.package_name
-
-        command_django_admin = './venv/bin/django-admin'
-
-        with temp_dir() as dir_tmp:
-            run_command(f'{command_django_admin} startproject {package_name} {dir_tmp}')
-
-            # We'd replace settings module paths.
-            replace = partial(
-                replace_infile,
-                pairs={f'{package_name}.settings': f'{package_name}.settings.auto'})
-
-            source_file = join(dir_tmp, 'manage.py')
-            replace(source_file)
-            shutil.move(source_file, join(dir_package, 'manage.py'))
-
-            source_file = join(dir_tmp, package_name, 'wsgi.py')
-            replace(source_file)
-            shutil.move(source_file, join(dir_package, 'wsgi.py'))
-
-            self.prepare_django_settings_base(dir_tmp)
-
-            shutil.move(join(dir_tmp, package_name, 'urls.py'), join(dir_package, 'urls.py'))
-
-        # Create basic app.
-        dir_app = join(dir_package, 'core')
-        run_command(f'{command_django_admin} startapp core {dir_app}')
-        replace_infile(
-            join(dir_app, 'apps.py'),
-            {
-                "'core'": f"'{package_name}.core'",  # Adapt for Django 3.2+
-            }
-        )
-        replace_infile(
-            join(dir_app, 'models.py'),
-            {
-                'from django.db import models':
-                    "from django.contrib.auth.models import AbstractUser\n"
-                    "from django.db import models\n\n"
-                    "class User(AbstractUser): pass"
-            }
+        code = (
+            'import os, django; '
+            'from django.core.management import call_command; '
+            f"os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{self.package_name}.settings.auto'); "
+            'django.setup(); '
+            "call_command('makemigrations'); "
+            "call_command('migrate')"
         )
+        run_command(f'venv/bin/python -c {quote(code)}')
 
 
 makeapp_config = WebscaffConfig
@@ -52,6 +52,20 @@ class Config(metaclass=ConfigMeta):
     cleanup: list[str] = None
     """Paths to cleanup after rollout."""
 
+    hooks_parallel: set[str] = None
+    """Names of hooks (e.g. 'rollout_post') safe to be run concurrently
+    with the same hooks of other templates.
+
+    Other hooks are run exclusively, after the hooks of all the preceding templates.
+
+    """
+
+    hooks_deps: dict[str, list[str]] = None
+    """Hook name -> names of templates which same hook should be finished
+    before this one. Applies to hooks from `hooks_parallel`.
+
+    """
+
     def __init__(self, app_template: 'AppTemplate'):
         """
 
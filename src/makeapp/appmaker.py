@@ -1,21 +1,22 @@
 import logging
 import os
-import re
 from contextlib import chdir
 from datetime import date
+from functools import partial
 from pathlib import Path
+from time import perf_counter
 from typing import Any
 
-import requests
-
-from .apptemplate import AppTemplate, TemplateFile
-from .exceptions import AppMakerException
+from .apptemplate import AppTemplate, TemplateFile, TemplatesGraph
+from .events import EVENTS, Events, HookFinished, HookStarted
+from .exceptions import AppMakerException, TaskError
 from .helpers.vcs import VcsHelper
 from .helpers.venvs import VenvHelper
-from .rendering import Renderer
-from .utils import PYTHON_VERSION, configure_logging, get_user_dir, read_ini
+from .names import NameChecker
+from .rendering import RenderCache, Renderer
+from .settings import Settings
+from .utils import PYTHON_VERSION, StagingDir, TaskGraph, configure_logging, get_user_dir, read_ini
 
-RE_UNKNOWN_MARKER = re.compile(r'{{ [^}]+ }}')
 BASE_PATH = os.path.dirname(__file__)
 
 
@@ -74,6 +75,15 @@ class AppMaker:
     app_template_default: AppTemplate = None
     """Default (root) application template object. Populated at runtime."""
 
+    hooks_max_workers: int | None = None
+    """Max number of template hooks to run concurrently. Default: depends on the number of CPUs."""
+
+    events: Events = EVENTS
+    """Instrumentation events dispatcher. See makeapp.events."""
+
+    render_cache: bool = True
+    """Whether to cache rendering results on disk (in .makeapp/cache/ under HOME). See RenderCache."""
+
     def __init__(
             self,
             app_name: str,
@@ -102,6 +112,10 @@ class AppMaker:
         self.logger.debug(f'Templates path: {self.path_templates_current}')
 
         self.app_templates: list[AppTemplate] = []
+
+        self.hooks_durations: dict[str, float] = {}
+        """Time spent in template hooks: <hook name>:<template name> -> seconds."""
+
         self._init_app_templates(templates_to_use)
 
         self.settings = self._init_settings(app_name)
@@ -112,23 +126,22 @@ class AppMaker:
         ]
 
         # Support for user-supplied template directories.
-        for template in templates_to_use or []:
-            if '/' in template:
-                parent = str(Path(template).parent)
-                if parent not in search_paths:
-                    search_paths.append(parent)
+        for app_template in self.app_templates:
+            parent = str(Path(app_template.path).parent)
+            if parent not in search_paths:
+                search_paths.append(parent)
 
-        self.renderer = Renderer(maker=self, paths=search_paths)
+        self.renderer = Renderer(maker=self, paths=search_paths, cache=RenderCache() if self.render_cache else None)
 
         self._hook_run('rollout_init')
 
-    def _init_settings(self, app_name: str) -> dict:
+    def _init_settings(self, app_name: str) -> Settings:
         """Initializes and returns base settings.
         
         :param app_name:
 
         """
-        settings = dict(self.BASE_SETTINGS)
+        settings = Settings(self.BASE_SETTINGS)
         self.logger.debug(f'Initial settings: {settings}')
 
         package_name = app_name.split('-', 1)[-1].replace('-', '_')
@@ -174,19 +187,24 @@ class AppMaker:
         if not names_or_paths or default_template_name not in names_or_paths:
             names_or_paths.insert(0, default_template_name)
 
+        graph = TemplatesGraph(self)
+        app_templates = [graph.add(template_spec) for template_spec in names_or_paths]
+
+        default = graph.add(default_template_name)
+        self.app_template_default = default
+
         prev_template = None
 
-        for template_spec in names_or_paths:
+        for app_template in graph.linearize(app_templates, default=default):
+            # Chain templates for files inheritance.
+            app_template.parent = prev_template
+            prev_template = app_template
 
-            prev_template = AppTemplate.contribute_to_maker(
-                maker=self,
-                template=template_spec,
-                parent=prev_template,
-            )
+            self.app_templates.append(app_template)
 
         self.logger.debug(f'Templates to use: {self.app_templates}')
 
-    def _replace_settings_markers(self, target: Any, strip_unknown: bool = False, settings: dict = None) -> str:
+    def _replace_settings_markers(self, target: Any, strip_unknown: bool = False, settings: Settings = None) -> str:
         """Replaces settings markers in `target` with current settings values
 
         :param target:
@@ -196,46 +214,36 @@ class AppMaker:
         """
         settings = settings or self.settings
 
-        if target is not None:
-
-            for name, val in settings.items():
-
-                if val is not None:
-                    target = str(target).replace('{{ %s }}' % name, str(val))
-
-        if strip_unknown:
-            target = re.sub(RE_UNKNOWN_MARKER, '', target)
+        if target is None:
+            return target
 
-        return target
+        return settings.substitute(target, strip_unknown=strip_unknown)
 
-    def check_app_name_is_available(self):
+    def check_app_name_is_available(self, *, checker: NameChecker | None = None):
         """Check some sites whether an application name is not already in use.
 
+        :param checker: Name checker to use. If not set, default registries are checked.
+
         :return: boolean
 
         """
         app_name = self.settings['app_name']
+        checker = checker or NameChecker(cache_dir=Path(self.path_user_confs) / 'cache')
 
         self.logger.info(f'Checking `{app_name}` name is available ...')
 
-        sites_registry = {
-            'PyPI': f'https://pypi.org/simple/{app_name}/',
-        }
-
         name_available = True
 
-        for label, url in sites_registry.items():
-            response = requests.get(url)
+        for status in checker.check([app_name]):
 
-            if response.status_code == 200:
-                self.logger.warning(f'Application name seems to be in use: {label} - {url}')
+            if status.in_use:
+                self.logger.warning(f'Application name seems to be in use: {status.registry} - {status.url}')
                 name_available = False
-                break
 
         if name_available:
             self.logger.info(
-                f"Application name `{self.settings['app_name']}` seems "
-                f"to be available (no mention found at: {', '.join(sites_registry)})")
+                f"Application name `{app_name}` seems "
+                f"to be available (no mention found at: {', '.join(checker.registries)})")
 
         return name_available
 
@@ -255,8 +263,21 @@ class AppMaker:
         """
         template_files = {}
 
+        # Inheritance map: relative path -> templates providing the file.
+        providers: dict[str, list[AppTemplate]] = {}
+
         for template in self.app_templates:
-            template_files.update(template.get_files())
+
+            if template.is_default:
+                # Default (root) template terminates inheritance chains.
+                providers = {}
+
+            for target, template_file in template.get_files().items():
+                parents = providers.setdefault(template_file.path_rel, [])
+                template_file.parents = parents[::-1]
+                parents.append(template)
+
+                template_files[target] = template_file
 
         self.logger.debug(f'Template files: {template_files}')
 
@@ -265,15 +286,85 @@ class AppMaker:
     def _hook_run(self, hook_name: str) -> dict[AppTemplate, bool]:
         """Runs the named hook for every app template.
 
+        Hooks declared safe to run in parallel (see Config.hooks_parallel)
+        are run concurrently in a worker pool respecting their dependencies,
+        others are run exclusively in templates order.
+
         Returns results dictionary indexed by app template objects.
 
         :param hook_name:
 
         """
         results = {}
+        graph = TaskGraph(max_workers=self.hooks_max_workers)
+
+        def run(app_template: AppTemplate):
+
+            if not EVENTS:
+                results[app_template] = app_template.run_config_hook(hook_name)
+                return
+
+            template = app_template.name
+            EVENTS.emit(HookStarted(hook_name, template=template))
+
+            started = perf_counter()
+            error = None
+
+            try:
+                results[app_template] = app_template.run_config_hook(hook_name)
+
+            except Exception as e:
+                error = e
+                raise
+
+            finally:
+                EVENTS.emit(HookFinished(hook_name, template=template, duration=perf_counter() - started, error=error))
+
+        names = {app_template.name for app_template in self.app_templates}
+        preceding = []
+        barrier = None  # The last hook to be run exclusively.
+        concurrent = False
 
         for app_template in self.app_templates:
-            results[app_template] = app_template.run_config_hook(hook_name)
+            config = app_template.config
+            task_name = f'{hook_name}:{app_template.name}'
+
+            if hook_name in (config.hooks_parallel or ()):
+                concurrent = True
+                deps = {
+                    f'{hook_name}:{name}'
+                    for name in (config.hooks_deps or {}).get(hook_name, ())
+                    if name in names
+                }
+
+                if barrier:
+                    deps.add(barrier)
+
+            else:
+                deps = preceding[:]
+                barrier = task_name
+
+            graph.add(task_name, partial(run, app_template), deps=sorted(deps))
+            preceding.append(task_name)
+
+        if concurrent:
+            try:
+                graph.run()
+
+            except TaskError:
+                # Propagate the original exception if any (e.g. not for a circular dependency).
+                if error := next((task.error for task in graph.tasks.values() if task.error), None):
+                    raise error from None
+
+                raise
+
+        else:
+            for task in graph.tasks.values():
+                task.run()
+
+        for task in graph.tasks.values():
+            self.hooks_durations[task.name] = task.duration
+            self.logger.debug(f'Hook {task.name} took {task.duration:.2f}s')
 
         return results
 
@@ -285,7 +376,8 @@ class AppMaker:
             init_repository: bool = False,
             init_venv: bool = False,
             remote_address: str = None,
-            remote_push: bool = False
+            remote_push: bool = False,
+            staged: bool = False
     ):
         """Rolls out the application skeleton into `dest` path.
 
@@ -301,6 +393,9 @@ class AppMaker:
 
         :param remote_push: Whether to push to remote.
 
+        :param staged: Whether to render all the files into a staging directory first
+            and then move them into place at once. See StagingDir.
+
         """
         self.logger.info(f'Application target path: {dest}')
 
@@ -320,27 +415,43 @@ class AppMaker:
 
         license_txt, license_src = self._get_license_data()
         license_src = self._comment_out(license_src)
-        license_dest = os.path.join(dest, 'LICENSE')
 
-        if not os.path.exists(license_dest) or overwrite:
-            self._create_file(license_dest, license_txt)
+        def is_writable(path_rel: str) -> bool:
+            return overwrite or not os.path.exists(os.path.join(dest, path_rel))
+
+        if not staged and is_writable('LICENSE'):
+            self._create_file(os.path.join(dest, 'LICENSE'), license_txt)
 
         with chdir(dest):
             self._hook_run('rollout_pre')
 
         files = self._get_template_files()
-        for target, template_file in files.items():
-            target = os.path.join(dest, target)
 
-            if not os.path.exists(target) or overwrite:
+        def get_prepend(path_rel: str) -> str | None:
+            # Prepend license text to source files if required.
+            return license_src if os.path.splitext(path_rel)[1] == '.py' else None
 
-                prepend = None
+        if staged:
+            with StagingDir(dest) as staging:
+                targets = [target for target in files if is_writable(target)]
+                staging.prepare(targets)
 
-                if os.path.splitext(target)[1] == '.py':
-                    # Prepend license text to source files if required.
-                    prepend = license_src
+                if is_writable('LICENSE'):
+                    staging.write('LICENSE', self._get_file_contents(license_txt))
 
-                self._copy_file(template_file, target, prepend)
+                for target in targets:
+                    self.logger.info(f'Creating {os.path.join(dest, target)} ...')
+                    template_file = files[target]
+                    staging.write(
+                        target,
+                        self._get_file_contents(self._render_file(template_file, get_prepend(target))),
+                        mode=self._get_file_mode(template_file),
+                    )
+
+        else:
+            for target, template_file in files.items():
+                if is_writable(target):
+                    self._copy_file(template_file, os.path.join(dest, target), get_prepend(target))
 
         with chdir(dest):
             self._hook_run('rollout_post')
@@ -367,6 +478,12 @@ class AppMaker:
 
         return '#\n#%s\n' % text.replace('\n', '\n#')
 
+    @staticmethod
+    def _get_file_contents(contents: str) -> str:
+        if contents.endswith('\n'):
+            contents += '\n'
+        return contents
+
     def _create_file(self, path: str, contents: str):
         """Creates a file with the given contents in the given path.
         Settings markers found in contents will be replaced with
@@ -377,11 +494,37 @@ class AppMaker:
 
         """
         with open(path, 'w') as f:
+            f.write(self._get_file_contents(contents))
 
-            f.write(contents)
+    def _render_file(self, src: TemplateFile, prepend_data: str | None = None) -> str:
+        """Renders a template file, optionally prepending some data.
 
-            if contents.endswith('\n'):
-                f.write('\n')
+        :param src: source file
+        :param prepend_data: data to prepend to rendered contents
+            (after the shebang line if any)
+
+        """
+        data = self.renderer.render(src)
+
+        if prepend_data is not None:
+
+            if data.startswith('#!'):
+                shebang, _, data = data.partition('\n')
+                data = f'{shebang}\n{prepend_data}{data}'
+
+            else:
+                data = prepend_data + data
+
+        return data
+
+    @staticmethod
+    def _get_file_mode(src: TemplateFile) -> int:
+        mode = src.mode
+
+        if mode is None:
+            mode = os.stat(src.path_full).st_mode
+
+        return mode
 
     def _copy_file(self, src: TemplateFile, dest: str, prepend_data: str = None):
         """Copies a file from `src` to `dest` replacing settings markers
@@ -399,16 +542,10 @@ class AppMaker:
         if not os.path.exists(dirname):
             os.makedirs(dirname)
 
-        data = self.renderer.render(src)
-
-        if prepend_data is not None:
-            data = prepend_data + data
-
-        self._create_file(dest, data)
+        self._create_file(dest, self._render_file(src, prepend_data))
 
         # Copy permissions.
-        mode = os.stat(src.path_full).st_mode
-        os.chmod(dest, mode)
+        os.chmod(dest, self._get_file_mode(src))
 
     def get_settings_string(self):
         """Returns settings string."""
@@ -564,11 +701,13 @@ class AppMaker:
                 f'Unsupported value `{val}` for `{setting}`. '
                 f'Acceptable variants [{variants}].')
 
-    def update_settings(self, settings_new: dict, settings_base: dict = None):
+    def update_settings(self, settings_new: dict, settings_base: Settings = None):
         """Updates current settings dictionary with values from a given
         settings dictionary. Settings markers existing in settings dict will
         be replaced with previously calculated settings values.
 
+        Only the given settings and those referencing them are re-evaluated.
+
         :param settings_new:
         :param settings_base:
         
@@ -576,13 +715,13 @@ class AppMaker:
         settings_base = settings_base or self.settings
 
         settings_base.update(settings_new)
-        for name, val in settings_base.items():
-            settings_base[name] = self._replace_settings_markers(val, settings=settings_base)
 
         self._validate_setting('license', list(self.LICENSES), settings_base)
 
         license = self.LICENSES[settings_base['license']]
-        settings_base['license_title'] = license[0]
-        settings_base['license_ident'] = license[1]
+        settings_base.update({
+            'license_title': license[0],
+            'license_ident': license[1],
+        })
 
         self._validate_setting('vcs', list(self.VCS), settings_base)
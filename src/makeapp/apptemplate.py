@@ -1,9 +1,23 @@
 import importlib.util
+import json
+import marshal
+import mmap
 import os
-from typing import TYPE_CHECKING
+import struct
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter
+from types import CodeType, ModuleType
+from typing import TYPE_CHECKING, ClassVar
+
+import jinja2
+from jinja2 import Environment
 
 from .appconfig import Config
+from .events import EVENTS, TemplateLoaded
 from .exceptions import AppMakerException
+from .sources import GitTemplateSource
 
 if TYPE_CHECKING:
     from .appmaker import AppMaker
@@ -15,21 +29,38 @@ class AppTemplate:
     config_filename = 'makeappconf.py'
     config_attr = 'makeapp_config'
 
-    def __init__(self, maker: 'AppMaker', name: str, path: str, parent: 'AppTemplate' = None):
+    config_modules: ClassVar[dict[str, tuple[tuple[int, int], ModuleType | None]]] = {}
+    """Process-wide config modules cache: config (or pack) path -> (file stamp, module)."""
+
+    def __init__(
+            self,
+            maker: 'AppMaker',
+            name: str,
+            path: str,
+            parent: 'AppTemplate' = None,
+            pack: 'TemplatePack' = None
+    ):
         """
 
         :param maker:
         :param name:
         :param path:
         :param parent:
+        :param pack: Template pack, if template is loaded from it.
 
         """
         self.maker = maker
         self.name = name
         self.path = path
         self.parent = parent
+        self.pack = pack
+
+        self.parents: list[AppTemplate] = []
+        """Direct parent templates (see Config.parent_template). Populated by TemplatesGraph."""
+
+        self._files: list[tuple[str, str, int]] | None = None
+
         self.config = self._read_config()
-        self._process_config()
 
     def __str__(self):
         return f'{self.name}: {self.path}'
@@ -45,16 +76,10 @@ class AppTemplate:
         If not found, dummy config object is returned.
 
         """
-        module_fake_name = f'makeapp.config.{self.name}'
-
         config_path = os.path.join(self.path, self.config_filename)
+        module = self._get_config_module()
 
-        if os.path.exists(config_path):
-
-            spec = importlib.util.spec_from_file_location(module_fake_name, config_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
+        if module:
             config: type[Config] = getattr(module, self.config_attr, None)
 
             if not issubclass(config, Config):
@@ -67,24 +92,54 @@ class AppTemplate:
 
         return Config(app_template=self)
 
-    def _process_config(self):
-        parent_names = self.config.parent_template
+    def _get_config_module(self) -> ModuleType | None:
+        """Returns template's config module or None if template has no config.
+
+        Modules are cached process-wide by their file path and modification time,
+        and are registered in `sys.modules` as `makeapp.config.<template name>`.
+
+        """
+        module_name = f'makeapp.config.{self.name}'
+        pack = self.pack
+
+        # Pack contains config, so the pack file is tracked.
+        path = f'{pack.path}' if pack else os.path.join(self.path, self.config_filename)
+
+        try:
+            stat = os.stat(path)
+
+        except FileNotFoundError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        modules = self.config_modules
+
+        cached = modules.get(path)
+
+        if cached and cached[0] == stamp:
+            module = cached[1]
+
+        elif pack:
+            module = pack.get_config_module(module_name)
+
+        else:
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+
+            try:
+                spec.loader.exec_module(module)
 
-        if parent_names:
+            except BaseException:
+                sys.modules.pop(module_name, None)
+                raise
 
-            parent = self.parent
+        modules[path] = (stamp, module)
 
-            for parent_name in parent_names:
-                # Inject parents.
-                # Here actually may be a graph, but
-                # for now don't bother with it, just handle the simplest case.
-                app_template = self.contribute_to_maker(
-                    maker=self.maker,
-                    template=parent_name,
-                    parent=parent,
-                )
-                parent = app_template
-                self.parent = app_template
+        if module:
+            sys.modules[module_name] = module
+
+        return module
 
     def run_config_hook(self, hook_name: str) -> bool:
         """Runs a hook function from app config template if defined there.
@@ -102,45 +157,92 @@ class AppTemplate:
 
         return False
 
+    def has_file(self, path_rel: str) -> bool:
+        """Whether the template contains a file.
+
+        :param path_rel: Path relative to template root.
+
+        """
+        if pack := self.pack:
+            return path_rel in pack.files
+
+        return os.path.exists(os.path.join(self.path, path_rel))
+
+    @classmethod
+    def iter_files(cls, path: str) -> Iterator[tuple[str, str, int]]:
+        """Yields (full path, relative path, mode) tuples for template files found in the given directory.
+
+        :param path: Template directory.
+
+        """
+        config_filename = cls.config_filename
+        dirs = ['']
+
+        while dirs:
+            dir_rel = dirs.pop()
+
+            with os.scandir(os.path.join(path, dir_rel)) as entries:
+
+                for entry in entries:
+                    fname = entry.name
+                    rel_path = f'{dir_rel}/{fname}' if dir_rel else fname
+
+                    if entry.is_dir():
+                        # Symlinked directories are not followed.
+                        if not entry.is_symlink():
+                            dirs.append(rel_path)
+                        continue
+
+                    if fname == '__pycache__' or os.path.splitext(fname)[-1] == '.pyc' or fname == config_filename:
+                        continue
+
+                    yield entry.path, rel_path, entry.stat().st_mode
+
     def get_files(self) -> dict[str, 'TemplateFile']:
         """Returns a mapping of relative filenames to TemplateFiles objects."""
 
         template_files = {}
 
         maker = self.maker
-        templates_path = self.path
-        config_filename = self.config_filename
 
-        for path, _, files in os.walk(templates_path):
+        files = self._files
 
-            for fname in files:
+        if files is None:
+            # Index files once.
+            if pack := self.pack:
+                files = [(os.path.join(self.path, rel_path), rel_path, mode) for rel_path, mode in pack.files.items()]
 
-                if fname == '__pycache__' or os.path.splitext(fname)[-1] == '.pyc' or fname == config_filename:
-                    continue
+            else:
+                files = list(self.iter_files(self.path))
 
-                full_path = os.path.join(path, fname)
+            self._files = files
 
-                rel_path = full_path.replace(templates_path, '').lstrip('/')
+        for full_path, rel_path, mode in files:
 
-                template_file = TemplateFile(
-                    template=self,
-                    path_full=full_path,
-                    path_rel=rel_path,
-                )
+            template_file = TemplateFile(
+                template=self,
+                path_full=full_path,
+                path_rel=rel_path,
+                mode=mode,
+            )
 
-                rel_path = rel_path.replace(maker.package_dir_marker, maker.settings['package_name'])
-                template_files[rel_path] = template_file
+            rel_path = rel_path.replace(maker.package_dir_marker, maker.settings['package_name'])
+            template_files[rel_path] = template_file
 
         return template_files
 
     @classmethod
-    def contribute_to_maker(cls, maker: 'AppMaker', template: str, parent: 'AppTemplate') -> 'AppTemplate':
-        """
+    def load(cls, maker: 'AppMaker', template: str) -> 'AppTemplate':
+        """Locates and loads a template.
+
         :param maker:
-        :param template:
-        :param parent:
+        :param template: Template name, path or source spec (e.g. git+URL).
 
         """
+        if GitTemplateSource.is_spec(template):
+            source = GitTemplateSource(template, cache_dir=Path(maker.path_user_confs) / 'templates')
+            template = f'{source.get_path()}'
+
         name, path = cls._find(
             template,
             search_paths=(
@@ -150,20 +252,19 @@ class AppTemplate:
             )
         )
 
-        app_template = AppTemplate(
+        pack = None
+
+        if path.endswith(TemplatePack.extension):
+            pack = TemplatePack(path)
+            name = pack.name
+
+        return AppTemplate(
             maker=maker,
             name=name,
             path=path,
-            parent=parent,
+            pack=pack,
         )
 
-        maker.app_templates.append(app_template)
-
-        if app_template.is_default:
-            maker.app_template_default = app_template
-
-        return app_template
-
     @classmethod
     def _find(cls, name_or_path: str, search_paths: tuple[str, ...]) -> tuple[str, str]:
         """Searches a template by its name or in path.
@@ -183,21 +284,162 @@ class AppTemplate:
             "Searched \n%s" % '\n  '.join(search_paths))
 
 
+class TemplatesGraph:
+    """Application templates dependency graph.
+
+    Every template (node) is loaded once however many templates refer to it
+    as a parent. Templates are then linearized with C3 algorithm (as used for Python MRO),
+    so that parents always go before their children, and the order is deterministic.
+
+    """
+    def __init__(self, maker: 'AppMaker'):
+        """
+        :param maker:
+
+        """
+        self.maker = maker
+
+        self.nodes: dict[str, AppTemplate] = {}
+        """Loaded templates indexed by paths."""
+
+        self._specs: dict[str, AppTemplate] = {}
+        self._loading: list[AppTemplate] = []
+        self._linearized: dict[AppTemplate, list[AppTemplate]] = {}
+
+    def add(self, template: str) -> AppTemplate:
+        """Adds a template along with its parents into the graph.
+        Returns template object.
+
+        :param template: Template name, path or source spec.
+
+        """
+        if app_template := self._specs.get(template):
+            return app_template
+
+        instrumented = bool(EVENTS)
+
+        if instrumented:
+            started = perf_counter()
+
+        app_template = AppTemplate.load(self.maker, template)
+
+        if instrumented:
+            EVENTS.emit(TemplateLoaded(app_template.name, path=app_template.path, duration=perf_counter() - started))
+
+        loading = self._loading
+
+        if known := self.nodes.get(app_template.path):
+
+            if known in loading:
+                cycle = [*loading[loading.index(known):], known]
+                raise AppMakerException(f"Circular templates reference: {' -> '.join(item.name for item in cycle)}.")
+
+            app_template = known
+
+        else:
+            self.nodes[app_template.path] = app_template
+
+            loading.append(app_template)
+            app_template.parents = [self.add(parent) for parent in app_template.config.parent_template or []]
+            loading.pop()
+
+        self._specs[template] = app_template
+
+        return app_template
+
+    def _get_bases(self, app_template: AppTemplate, default: AppTemplate) -> list[AppTemplate]:
+        # The latter parent overrides the former, so it goes first.
+        bases = app_template.parents[::-1]
+
+        if not bases and app_template is not default:
+            # Templates without parents implicitly extend the default one.
+            bases = [default]
+
+        return bases
+
+    def _linearize(self, app_template: AppTemplate, default: AppTemplate) -> list[AppTemplate]:
+        linearized = self._linearized.get(app_template)
+
+        if linearized is None:
+            bases = self._get_bases(app_template, default)
+            linearized = [app_template, *self._merge([
+                *(self._linearize(base, default) for base in bases),
+                bases,
+            ])]
+            self._linearized[app_template] = linearized
+
+        return linearized
+
+    @classmethod
+    def _merge(cls, sequences: list[list[AppTemplate]]) -> list[AppTemplate]:
+        result = []
+        sequences = [sequence[:] for sequence in sequences if sequence]
+
+        while sequences:
+
+            for sequence in sequences:
+                head = sequence[0]
+
+                if not any(head in other[1:] for other in sequences):
+                    break
+
+            else:
+                names = [[item.name for item in sequence] for sequence in sequences]
+                raise AppMakerException(f'Inconsistent templates hierarchy. Unable to order: {names}.')
+
+            result.append(head)
+            sequences = [
+                remaining
+                for sequence in sequences
+                if (remaining := sequence[1:] if sequence[0] is head else sequence)
+            ]
+
+        return result
+
+    def linearize(self, app_templates: list[AppTemplate], *, default: AppTemplate) -> list[AppTemplate]:
+        """Returns given templates along with all their ancestors ordered from the base one
+        to the most specific one (the latter overrides the former).
+
+        :param app_templates: Templates to use, in order (the latter overrides the former).
+        :param default: Default (root) template.
+
+        """
+        bases = app_templates[::-1]
+        self._linearized.clear()
+
+        ordered = self._merge([*(self._linearize(base, default) for base in bases), bases])
+
+        return ordered[::-1]
+
+
 class TemplateFile:
     """Represents app template file info."""
 
-    __slots__ = ['path_full', 'path_rel', 'template']
-
-    def __init__(self, template: AppTemplate, path_full: str, path_rel: str):
+    __slots__ = ['mode', 'parents', 'path_full', 'path_rel', 'template']
+
+    def __init__(
+            self,
+            template: AppTemplate,
+            path_full: str,
+            path_rel: str,
+            *,
+            mode: int | None = None,
+            parents: list[AppTemplate] | None = None
+    ):
         """
         :param template:
         :param path_full:
         :param path_rel:
+        :param mode: File permissions mode.
+        :param parents: Parent templates providing the same file, the nearest first.
+            If not set, it's computed on demand walking templates chain.
 
         """
         self.template = template
         self.path_full = path_full
         self.path_rel = path_rel
+        self.mode = mode
+        self.parents = parents
 
     def __str__(self):
         return self.path_full
@@ -205,25 +447,205 @@ class TemplateFile:
     @property
     def parent_paths(self):
         """A list of parent template paths."""
-        paths = []
 
         path_rel = self.path_rel
+        parents = self.parents
+
+        if parents is None:
+            parents = []
+            parent = self.template
+
+            while True:
+                parent = parent.parent
+
+                if not parent:
+                    break
+
+                if parent.has_file(path_rel):
+                    # Check parent file exists in template.
+                    parents.append(parent)
+
+                if parent.is_default:
+                    break
+
+        return [os.path.join(parent.name, path_rel) for parent in parents]
+
+
+class TemplatePack:
+    """Single-file precompiled application template.
+
+    Layout: magic bytes, index size, JSON index, data. The index holds template name,
+    files modes and (offset, size) data spans for files sources, compiled
+    Jinja templates code and marshalled config module code.
+
+    Pack is memory-mapped on load, so only the data actually used is read.
+    Precompiled code is used only if Python and Jinja versions match those
+    of the pack creator, otherwise sources are compiled on the fly.
+
+    """
+    extension = '.mapack'
+    magic = b'MAPACK1\n'
+
+    _index_size = struct.Struct('<Q')
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: Pack file path.
+
+        """
+        self.path = Path(path)
+
+        with self.path.open('rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic = self.magic
+        offset = len(magic)
+
+        if data[:offset] != magic:
+            data.close()
+            raise AppMakerException(f'Not a template pack: {path}.')
+
+        (index_size,) = self._index_size.unpack_from(data, offset)
+        offset += self._index_size.size
+
+        index = json.loads(data[offset:offset + index_size])
+
+        self._data = data
+        self._offset = offset + index_size
+        self._spans: dict[str, list[int]] = index['spans']
+        self._compiled = index['python'] == sys.implementation.cache_tag and index['jinja'] == jinja2.__version__
+
+        self.name: str = index['name']
+        self.files: dict[str, int] = index['files']
+        """Relative file paths to their modes."""
+
+    def __str__(self):
+        return f'{self.path}'
+
+    def _read(self, key: str) -> bytes | None:
+        span = self._spans.get(key)
+
+        if span is None:
+            return None
+
+        start = self._offset + span[0]
+
+        return self._data[start:start + span[1]]
+
+    def get_source(self, path_rel: str) -> str:
+        """Returns template file source.
+
+        :param path_rel: Path relative to template root.
+
+        """
+        source = self._read(f'src/{path_rel}')
+
+        if source is None:
+            raise jinja2.TemplateNotFound(f'{self.name}/{path_rel}')
+
+        return source.decode()
+
+    def get_template_code(self, environment: Environment, path_rel: str) -> CodeType:
+        """Returns compiled template code.
+
+        :param environment: Jinja environment to compile template with, if no precompiled code available.
+        :param path_rel: Path relative to template root.
+
+        """
+        if self._compiled and (code := self._read(f'code/{path_rel}')) is not None:
+            return marshal.loads(code)
+
+        name = f'{self.name}/{path_rel}'
+
+        return environment.compile(self.get_source(path_rel), name, f'{self.path}/{path_rel}')
+
+    def get_config_module(self, module_name: str) -> ModuleType | None:
+        """Returns template config module or None if template has no config.
+
+        :param module_name: Name to give to the module.
+
+        """
+        filename = f'{self.path}/{AppTemplate.config_filename}'
+
+        if self._compiled and (code := self._read('config/code')) is not None:
+            code = marshal.loads(code)
+
+        elif (source := self._read('config/src')) is not None:
+            code = compile(source, filename, 'exec')
+
+        else:
+            return None
+
+        module = ModuleType(module_name)
+        module.__file__ = filename
+        exec(code, module.__dict__)
+
+        return module
+
+    def close(self):
+        self._data.close()
+
+    @classmethod
+    def create(cls, path: str | Path, target: str | Path | None = None, *, environment: Environment) -> Path:
+        """Creates a pack from a template directory. Returns pack file path.
+
+        :param path: Template directory.
+        :param target: Pack file path. Default: <template name>.mapack in the current directory.
+        :param environment: Jinja environment to compile templates with.
+            Should be configured the same way as the one used for rendering.
+
+        """
+        path = Path(path).absolute()
+        name = path.name
+        target = Path(target or f'{name}{cls.extension}')
+
+        files = {}
+        spans = {}
+        chunks = []
+        offset = 0
+
+        def add(key: str, data: bytes):
+            nonlocal offset
+            spans[key] = [offset, len(data)]
+            chunks.append(data)
+            offset += len(data)
+
+        for full_path, rel_path, mode in sorted(AppTemplate.iter_files(f'{path}'), key=lambda item: item[1]):
+            source = Path(full_path).read_bytes()
+
+            try:
+                code = environment.compile(source.decode(), f'{name}/{rel_path}', f'{target}/{rel_path}')
+
+            except (UnicodeDecodeError, jinja2.TemplateSyntaxError) as e:
+                raise AppMakerException(f'Unable to compile template file {full_path}: {e}') from e
+
+            files[rel_path] = mode
+            add(f'src/{rel_path}', source)
+            add(f'code/{rel_path}', marshal.dumps(code))
 
-        parent = self.template
+        config_path = path / AppTemplate.config_filename
 
-        while True:
-            parent = parent.parent
+        if config_path.exists():
+            source = config_path.read_bytes()
+            add('config/src', source)
+            add('config/code', marshal.dumps(compile(source, f'{target}/{config_path.name}', 'exec')))
 
-            if not parent:
-                break
+        index = json.dumps({
+            'name': name,
+            'python': sys.implementation.cache_tag,
+            'jinja': jinja2.__version__,
+            'files': files,
+            'spans': spans,
+        }).encode()
 
-            path_full = os.path.join(parent.path, path_rel)
+        target_tmp = target.with_suffix('.tmp')
 
-            if os.path.exists(path_full):
-                # Check parent file exists in template.
-                paths.append(os.path.join(parent.name, path_rel))
+        with target_tmp.open('wb') as f:
+            f.write(cls.magic)
+            f.write(cls._index_size.pack(len(index)))
+            f.write(index)
+            f.writelines(chunks)
 
-            if parent.is_default:
-                break
+        target_tmp.replace(target)
 
-        return paths
+        return target
@@ -1,23 +1,32 @@
+import json
 import logging
 import os
+import re
 import tomllib
 from contextlib import chdir
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from time import time_ns
+from typing import Any, ClassVar
 
+from .events import EVENTS, Events
 from .exceptions import ProjectorExeption
 from .helpers.dist import DistHelper
 from .helpers.files import FileHelper
 from .helpers.tests import TestsHelper
 from .helpers.vcs import VcsHelper
 from .helpers.venvs import VenvHelper
-from .utils import MkDocs, Ruff, Uv, configure_logging
+from .utils import MkDocs, Ruff, TaskGraph, Uv, configure_logging
 
 LOG = logging.getLogger(__name__)
 
 
 VERSION_NUMBER_CHUNKS = ('major', 'minor', 'patch')
 
+CACHE_DIRNAME = '.makeapp'
+"""Project directory to store makeapp cache files."""
+
 
 class DataContainer:
     """Base for information gathering classes."""
@@ -76,10 +85,11 @@ class PackageData(DataContainer):
         return self.get_version_str(self.version_next)
 
     @classmethod
-    def get(cls, *, package_path: Path) -> 'PackageData':
+    def get(cls, *, package_path: Path, line_idx: int | None = None) -> 'PackageData':
         """Gathers information from a package,
 
         :param package_path:
+        :param line_idx: Known version line index.
 
         """
         LOG.debug(f'Getting version from `{package_path}` package ...')
@@ -89,10 +99,15 @@ class PackageData(DataContainer):
 
         version_attr = cls.VERSION_ATTR
         version_line_idx = None
-        for idx, line in enumerate(init_file):
-            if line.startswith(version_attr):
-                version_line_idx = idx
-                break
+
+        if line_idx is not None and line_idx < len(init_file) and init_file[line_idx].startswith(version_attr):
+            version_line_idx = line_idx
+
+        else:
+            for idx, line in enumerate(init_file):
+                if line.startswith(version_attr):
+                    version_line_idx = idx
+                    break
 
         if version_line_idx is None:
             raise ProjectorExeption('Version line not found in init file.')
@@ -186,9 +201,49 @@ class ChangelogData(DataContainer):
     _offset_change = 1
 
     @classmethod
-    def get(cls) -> 'ChangelogData':
-        """Gathers information from a changelog."""
+    def _is_version_line(cls, line: str) -> bool:
+        line = line.lstrip('# ')
+        return line == cls.marker_unreleased or line.startswith('v')
+
+    @classmethod
+    def _read_head(cls, filepath: Path) -> tuple[list[str], int | None]:
+        """Reads changelog head: lines up to the end of the latest version section.
+
+        :param filepath:
+
+        """
+        version_line_idx = None
+        is_version_line = cls._is_version_line
+
+        def is_head_end(idx: int, line: str) -> bool:
+            nonlocal version_line_idx
+
+            if idx < 2:
+                return False
+
+            if version_line_idx is None:
+
+                if idx <= 4 and is_version_line(line):
+                    version_line_idx = idx
+                    return False
 
+                # Not found in expected positions. Stop reading.
+                return idx >= 4
+
+            return not line.strip()
+
+        return FileHelper.read_head(filepath, until=is_head_end)
+
+    @classmethod
+    def get(cls, *, head_size: int | None = None) -> 'ChangelogData':
+        """Gathers information from a changelog.
+
+        Only the changelog head (up to the end of the latest version section)
+        is read, the rest of the file is left untouched on write.
+
+        :param head_size: Known changelog head size in bytes.
+
+        """
         filepath = Path(cls.filename)
 
         LOG.debug(f'Getting changelog from: {filepath.name} ...')
@@ -196,7 +251,14 @@ class ChangelogData(DataContainer):
         if not filepath.is_file():
             raise ProjectorExeption('Changelog file not found.')
 
-        changelog = FileHelper.read_file(filepath)
+        try:
+            if not head_size:
+                raise ValueError('Unknown head size')
+
+            changelog, head_size = FileHelper.read_head(filepath, size=head_size)
+
+        except ValueError:
+            changelog, head_size = cls._read_head(filepath)
 
         if not changelog[0].startswith('# '):
             raise ProjectorExeption('Unexpected changelog file format.')
@@ -206,10 +268,14 @@ class ChangelogData(DataContainer):
         version_line_idx = None
 
         for supposed_line_idx in (2, 3, 4):
+
+            if supposed_line_idx >= len(changelog):
+                break
+
             line = changelog[supposed_line_idx].lstrip('# ')
             unreleased_entry_exists = line == unreleased_str
 
-            if unreleased_entry_exists or line.startswith('v'):
+            if cls._is_version_line(line):
                 version_line_idx = supposed_line_idx
                 LOG.info(f'Current version from changelog: {line}.')
                 break
@@ -228,7 +294,8 @@ class ChangelogData(DataContainer):
             file_helper=FileHelper(
                 filepath=filepath,
                 line_idx=version_line_idx,
-                contents=changelog
+                contents=changelog,
+                head_size=head_size,
             )
         )
 
@@ -332,9 +399,334 @@ class ChangelogData(DataContainer):
         super().write()
 
 
+class ChangelogSection:
+    """Represents a version section of a changelog."""
+
+    __slots__ = ['date', 'entries', 'line_end', 'line_start', 'version']
+
+    def __init__(
+            self,
+            version: str,
+            *,
+            date: str | None = None,
+            line_start: int = 0,
+            line_end: int = 0,
+            entries: dict[str, list[str]] | None = None
+    ):
+        """
+        :param version: Version string, e.g. v1.2.3 or Unreleased
+        :param date: Release date string
+        :param line_start: Index of the section title line.
+        :param line_end: Index of the line following the section.
+        :param entries: Change entries texts indexed by change markers.
+
+        """
+        self.version = version
+        self.date = date
+        self.line_start = line_start
+        self.line_end = line_end
+        self.entries = entries or {}
+
+    def __str__(self):
+        date = f' [{self.date}]' if self.date else ''
+        lines = [f'{ChangelogData._prefix_version}{self.version}{date}']
+
+        for marker, entries in self.entries.items():
+            lines.extend(f'{ChangelogData._prefix_change}{marker * 2} {entry}' for entry in entries)
+
+        return '\n'.join(lines)
+
+    def as_dict(self) -> dict:
+        return {attr: getattr(self, attr) for attr in ('version', 'date', 'line_start', 'line_end', 'entries')}
+
+
+class ChangelogIndex:
+    """Index of all version sections of a changelog.
+
+    Built in one pass over a changelog file and cached (in process and on disk)
+    keyed by file modification time and size.
+
+    """
+    cache_filename = 'changelog.json'
+
+    _re_section = re.compile(rf'^(?:#+ )?(v\d[\w.\-]*|{ChangelogData.marker_unreleased})(?: \[([^\]]*)\])?\s*$')
+    _re_entry = re.compile(rf'^\* ([{re.escape(ChangelogData.change_markers)}])\1 (.*)$')
+    _re_entry_legacy = re.compile(rf'^([{re.escape(ChangelogData.change_markers)}]) (.*)$')
+
+    _cache: ClassVar[dict[str, tuple[tuple[int, int], 'ChangelogIndex']]] = {}
+
+    def __init__(self, sections: list[ChangelogSection]):
+        """
+        :param sections: Version sections, the latest first.
+
+        """
+        self.sections = sections
+        self._positions = {section.version: idx for idx, section in enumerate(sections)}
+
+    @classmethod
+    def normalize_version(cls, version: str) -> str:
+        """Returns version string as used in changelog.
+
+        :param version: E.g. 1.2.3 or v1.2.3
+
+        """
+        version = version.strip()
+
+        if version[:1].isdigit():
+            version = f'v{version}'
+
+        return version
+
+    def get_section(self, version: str) -> ChangelogSection:
+        """Returns a section for the given version.
+
+        :param version:
+
+        """
+        version = self.normalize_version(version)
+        idx = self._positions.get(version)
+
+        if idx is None:
+            raise ProjectorExeption(f'Version `{version}` not found in the changelog.')
+
+        return self.sections[idx]
+
+    def get_since(self, version: str) -> list[ChangelogSection]:
+        """Returns sections for versions following the given one.
+
+        :param version:
+
+        """
+        return self.sections[:self._positions[self.get_section(version).version]]
+
+    @classmethod
+    def parse(cls, filepath: Path) -> 'ChangelogIndex':
+        """Builds an index reading the given changelog file line by line.
+
+        :param filepath:
+
+        """
+        LOG.debug(f'Indexing changelog {filepath} ...')
+
+        re_section = cls._re_section
+        re_entry = cls._re_entry
+        re_entry_legacy = cls._re_entry_legacy
+
+        sections = []
+        section = None
+        entries = None
+        idx = -1
+
+        with filepath.open() as f:
+
+            for idx, line in enumerate(f):
+                line = line.rstrip()
+
+                if match := re_section.match(line):
+                    if section:
+                        section.line_end = idx
+
+                    section = ChangelogSection(match.group(1), date=match.group(2), line_start=idx)
+                    sections.append(section)
+                    entries = None
+                    continue
+
+                if section is None or not line:
+                    continue
+
+                if match := (re_entry.match(line) or re_entry_legacy.match(line)):
+                    marker, text = match.groups()
+                    entries = section.entries.setdefault(marker, [])
+                    entries.append(text.strip())
+
+                elif entries and line[0].isspace():
+                    # Multiline entry.
+                    entries[-1] = f'{entries[-1]} {line.strip()}'
+
+        if section:
+            section.line_end = idx + 1
+
+        return cls(sections)
+
+    @classmethod
+    def get(cls, filepath: Path | None = None, *, cache_dir: Path | None = None) -> 'ChangelogIndex':
+        """Returns changelog index, using cache if the file has not changed.
+
+        :param filepath: Changelog file path. Default: changelog in the current directory.
+        :param cache_dir: Directory to store index cache in. Default: .makeapp in the current directory.
+
+        """
+        filepath = Path(filepath or ChangelogData.filename)
+
+        if not filepath.is_file():
+            raise ProjectorExeption('Changelog file not found.')
+
+        stat = filepath.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        path_abs = f'{filepath.absolute()}'
+
+        cached = cls._cache.get(path_abs)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        cache_file = Path(cache_dir or CACHE_DIRNAME) / cls.cache_filename
+
+        index = cls._cache_read(cache_file, key=key)
+
+        if index is None:
+            index = cls.parse(filepath)
+            cls._cache_write(cache_file, key=key, index=index)
+
+        cls._cache[path_abs] = (key, index)
+
+        return index
+
+    @classmethod
+    def _cache_read(cls, cache_file: Path, *, key: tuple[int, int]) -> 'ChangelogIndex | None':
+        try:
+            data = json.loads(cache_file.read_text())
+
+        except (OSError, ValueError):
+            return None
+
+        if tuple(data.get('key', ())) != key:
+            return None
+
+        LOG.debug(f'Changelog index loaded from {cache_file}')
+
+        return cls([ChangelogSection(**section) for section in data['sections']])
+
+    @classmethod
+    def _cache_write(cls, cache_file: Path, *, key: tuple[int, int], index: 'ChangelogIndex'):
+        data = {
+            'key': key,
+            'sections': [section.as_dict() for section in index.sections],
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_tmp = cache_file.with_suffix('.tmp')
+            cache_tmp.write_text(json.dumps(data))
+            cache_tmp.replace(cache_file)
+
+        except OSError as e:
+            LOG.debug(f'Unable to write changelog index cache: {e}')
+
+
+class ProjectSnapshot:
+    """Project metadata (package path, version line, changelog head size, etc.)
+    stored in .makeapp/ project subdirectory to skip discovery on subsequent runs.
+
+    Every entry is validated against modification times and sizes of files it was computed from.
+
+    """
+    filename = 'project.json'
+
+    racy_window = 2_000_000_000
+    """Files modified within this time (ns) before the entry is set
+    are not trusted since they may be changed again without mtime change."""
+
+    def __init__(self, project_path: Path):
+        """
+        :param project_path:
+
+        """
+        self.path = project_path / CACHE_DIRNAME / self.filename
+        self._data: dict | None = None
+        self._changed = False
+
+    @property
+    def data(self) -> dict:
+        data = self._data
+
+        if data is None:
+            try:
+                data = json.loads(self.path.read_text())
+
+            except (OSError, ValueError):
+                data = {}
+
+            self._data = data
+
+        return data
+
+    @staticmethod
+    def get_stamp(path: Path) -> list[int] | None:
+        """Returns file stamp: [mtime, size]. None if file does not exist.
+
+        :param path:
+
+        """
+        try:
+            stat = path.stat()
+
+        except OSError:
+            return None
+
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def get(self, key: str, *paths: Path) -> Any:
+        """Returns an entry value if it's valid for the given files.
+
+        :param key:
+        :param paths: Files the entry was computed from.
+
+        """
+        entry = self.data.get(key)
+
+        if not entry or entry['stamps'] != [self.get_stamp(path) for path in paths]:
+            return None
+
+        return entry['value']
+
+    def set(self, key: str, value: Any, *paths: Path, written: bool = False):
+        """Sets an entry value computed from the given files.
+
+        :param key:
+        :param value:
+        :param paths: Files the entry was computed from.
+        :param written: The value is known to be valid since the files have just been written
+            by us, so the recently modified files are trusted.
+
+        """
+        stamps = [self.get_stamp(path) for path in paths]
+        racy_threshold = time_ns() - self.racy_window
+
+        if not written and any(stamp and stamp[0] > racy_threshold for stamp in stamps):
+            # Entry can't be validated reliably.
+            self._changed = self.data.pop(key, None) is not None or self._changed
+            return
+
+        entry = {'stamps': stamps, 'value': value}
+
+        if self.data.get(key) != entry:
+            self.data[key] = entry
+            self._changed = True
+
+    def save(self):
+        """Saves the snapshot if changed."""
+
+        if not self._changed:
+            return
+
+        path = self.path
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path_tmp = path.with_suffix('.tmp')
+            path_tmp.write_text(json.dumps(self.data))
+            path_tmp.replace(path)
+            self._changed = False
+
+        except OSError as e:
+            LOG.debug(f'Unable to save project snapshot: {e}')
+
+
 class Project:
     """Encapsulates application (project) related logic."""
 
+    events: Events = EVENTS
+    """Instrumentation events dispatcher. See makeapp.events."""
+
     @classmethod
     def find_packages(cls, where: Path, *, prefer: str) -> list[Path]:
 
@@ -351,10 +743,15 @@ class Project:
 
         return packages_found
 
-    def __init__(self, project_path: Path = None, *, log_level: int = None):
+    members_exclude = frozenset({'dist', 'build', 'site', 'node_modules', '__pycache__'})
+    """Directories not searched for monorepo members (in addition to hidden ones)."""
+
+    def __init__(self, project_path: Path = None, *, log_level: int = None, vcs: VcsHelper | None = None):
         """
         :param project_path: Application root (containing pyproject.toml) path.
         :param log_level: Logging level
+        :param vcs: VCS helper to use. If not set, it is deduced from the project path.
+            Useful for monorepo members sharing the repository.
 
         """
         self.configure_logging(log_level)
@@ -363,8 +760,9 @@ class Project:
         self.project_path = Path(project_path)
         self.package: PackageData | None = None
         self.changelog: ChangelogData | None = None
-        self.vcs = VcsHelper.get(project_path)
+        self.vcs = vcs or VcsHelper.get(project_path)
         self.venv = VenvHelper(project_path)
+        self.snapshot = ProjectSnapshot(self.project_path)
         self._setting = {}
 
     def configure_logging(self, verbosity_lvl: int = None, format: str = '%(message)s'):
@@ -383,14 +781,21 @@ class Project:
 
         if not settings:
 
-            path = Path("pyproject.toml")
-            if not path.exists():
-                raise ProjectorExeption('No `pyproject.toml` file found in the current directory.')
+            path = self.project_path / "pyproject.toml"
+            snapshot = self.snapshot
+            settings = snapshot.get('settings', path)
 
-            with path.open("rb") as f:
-                data = tomllib.load(f)
+            if settings is None:
+
+                if not path.exists():
+                    raise ProjectorExeption('No `pyproject.toml` file found in the current directory.')
+
+                with path.open("rb") as f:
+                    data = tomllib.load(f)
+
+                settings = data.get("tool", {}).get("makeapp", {})
+                snapshot.set('settings', settings, path)
 
-            settings = data.get("tool", {}).get("makeapp", {})
             self._setting = settings
 
         return settings
@@ -409,22 +814,97 @@ class Project:
             self.get_settings()
             self.vcs.check()
 
-            parent_dirname = project_path.parent.name
+            snapshot = self.snapshot
+
+            # Directories mtimes are not used for validation, since they change
+            # on every file replacement (e.g. changelog rewrite). A known package
+            # is trusted as long as it exists.
+            package = snapshot.get('package')
 
-            packages = self.find_packages(project_path, prefer=parent_dirname)
-            if not packages:
-                # src layout
-                packages = self.find_packages(project_path / 'src', prefer=parent_dirname)
+            if package is None or not (project_path / package / '__init__.py').exists():
+                package = self._find_package()
+                snapshot.set('package', f'{package.relative_to(project_path)}')
 
-            LOG.debug(f'Found packages: {packages}')
+            package = project_path / package
+
+            self.package = PackageData.get(
+                package_path=package,
+                line_idx=snapshot.get('version_line', package / '__init__.py'),
+            )
+            self.changelog = ChangelogData.get(
+                head_size=snapshot.get('changelog_head', project_path / ChangelogData.filename),
+            )
 
-            if not packages:
-                raise ProjectorExeption('No package found.')
+            self._snapshot_update()
 
-            package = packages[0]
+    def _find_package(self) -> Path:
+        """Searches for a project package."""
 
-            self.package = PackageData.get(package_path=package)
-            self.changelog = ChangelogData.get()
+        project_path = self.project_path
+        parent_dirname = project_path.parent.name
+
+        packages = self.find_packages(project_path, prefer=parent_dirname)
+        if not packages:
+            # src layout
+            packages = self.find_packages(project_path / 'src', prefer=parent_dirname)
+
+        LOG.debug(f'Found packages: {packages}')
+
+        if not packages:
+            raise ProjectorExeption('No package found.')
+
+        return packages[0]
+
+    def _snapshot_update(self, *written: DataContainer):
+        """Updates project snapshot with current package and changelog data.
+
+        :param written: Data containers just written to files.
+
+        """
+        snapshot = self.snapshot
+
+        if package := self.package:
+            snapshot.set(
+                'version_line', package.file_helper.line_idx, package.filepath,
+                written=package in written,
+            )
+
+        if changelog := self.changelog:
+            filepath = self.project_path / changelog.filepath
+            snapshot.set(
+                'changelog_head', changelog.file_helper.head_size, filepath,
+                written=changelog in written,
+            )
+
+        snapshot.save()
+
+    @property
+    def name(self) -> str:
+        """Project name (directory name)."""
+        return self.project_path.name
+
+    def get_members(self) -> list['Project']:
+        """Returns monorepo member projects: subdirectories having
+        their own pyproject.toml and changelog.
+
+        """
+        members = []
+        exclude = self.members_exclude
+        changelog_filename = ChangelogData.filename
+
+        for path, dirs, files in os.walk(self.project_path):
+
+            if path != f'{self.project_path}' and 'pyproject.toml' in files and changelog_filename in files:
+                # Keep logging level (e.g. debug) of the root project.
+                members.append(Project(Path(path), log_level=LOG.level or None, vcs=self.vcs))
+                dirs.clear()
+                continue
+
+            dirs[:] = sorted(name for name in dirs if name not in exclude and not name.startswith('.'))
+
+        LOG.debug(f'Found members: {[member.name for member in members]}')
+
+        return members
 
     def pull(self):
         """Pulls changes from a remote repository"""
@@ -461,17 +941,70 @@ class Project:
         vcs = self.vcs
 
         with chdir(self.project_path):
+            files = []
 
             for info in (self.package, self.changelog):
                 info.write()
-                vcs.add(info.filepath)
+                files.append(info.filepath)
+
+            self._snapshot_update(self.package, self.changelog)
 
             LOG.debug('Commit VCS changes ...')
 
-            vcs.commit(f'Release {next_version_str}')
+            vcs.commit(f'Release {next_version_str}', files=files)
 
             vcs.add_tag(next_version_str, version_summary, overwrite=True)
 
+    def get_release_info_all(self, increment: str | None = None) -> dict['Project', tuple[str, str]]:
+        """Returns release info tuples for monorepo members having unreleased changes.
+
+        :param increment: Version chunk to increment (major, minor, patch)
+            If not set, will be deduced from changelog data for every member.
+
+        """
+        releases = {}
+
+        for member in self.get_members():
+            next_version_str, version_summary = member.get_release_info(increment)
+
+            if version_summary:
+                releases[member] = (next_version_str, version_summary)
+
+        return releases
+
+    def release_all(self, releases: dict['Project', tuple[str, str]]):
+        """Makes a release of multiple monorepo members at once.
+
+        * Bumps members version numbers
+        * Adds members changelogs info
+        * Commits all the changes at once
+        * Tags VCS for every member: <member name>-<version>
+
+        :param releases: Release info tuples indexed by members. See .get_release_info_all()
+
+        """
+        vcs = self.vcs
+        files = []
+
+        for member in releases:
+            member_path = member.project_path
+
+            with chdir(member_path):
+                for info in (member.package, member.changelog):
+                    info.write()
+                    files.append(member_path / info.filepath)
+
+            member._snapshot_update(member.package, member.changelog)
+
+        with chdir(self.project_path):
+            LOG.debug('Commit VCS changes ...')
+
+            summary = ', '.join(f'{member.name} {version}' for member, (version, _) in releases.items())
+            vcs.commit(f'Release {summary}', files=files)
+
+            for member, (version, summary) in releases.items():
+                vcs.add_tag(f'{member.name}-{version}', summary, overwrite=True)
+
     def add_change(self, descriptions: list[str] | tuple[str, ...] | str, *, stage_modified: bool = True):
         """Add a change description into changelog.
 
@@ -500,30 +1033,91 @@ class Project:
                 changelog.add_change(description)
 
             changelog.write()
+            self._snapshot_update(changelog)
 
             commit_message = f'{changelog.filename} updated'
 
-            files_to_stage = [changelog.filepath]
-
             if stage_modified:
-                files_to_stage.extend(self.vcs.get_modified())
-
                 # Set a description as a commit message.
                 commit_message = '\n'.join(
                     description.strip(changelog.change_markers)
                     for description in descriptions
                 )
 
-            self.vcs.add(files_to_stage)
-            self.vcs.commit(commit_message.strip())
+            # Changelog is modified too, so it'll be staged along with others.
+            self.vcs.commit(
+                commit_message.strip(),
+                files=[changelog.filepath],
+                all_modified=stage_modified,
+            )
+
+    def get_changelog_sections(self, version: str | None = None, *, since: str | None = None) -> list[ChangelogSection]:
+        """Returns changelog version sections.
+
+        :param version: Version to get section for. If not set, the latest section is returned.
+        :param since: Get sections for all versions following this one.
+
+        """
+        with chdir(self.project_path):
+            index = ChangelogIndex.get()
+
+        if since:
+            return index.get_since(since)
+
+        if version:
+            return [index.get_section(version)]
+
+        return index.sections[:1]
+
+    def build(self, *, force: bool = False) -> list[Path]:
+        """Builds distribution artifacts (reusing cached ones if the sources are unchanged).
+
+        :param force: Rebuild even if cached artifacts are available.
+
+        """
+        LOG.info('Building distribution ...')
+
+        with chdir(self.project_path):
+            return DistHelper.build(force=force)
 
     def publish(self):
         """Uploads project data to remote VCS and Python Package Index server."""
         LOG.info('Publishing application ...')
 
+        # Distribution build doesn't depend on push, so they are run concurrently.
+        tasks = TaskGraph()
+        tasks.add('push', self.vcs.push)
+        tasks.add('build', DistHelper.build)
+        tasks.add('upload', DistHelper.publish, deps=['push', 'build'])
+
+        with chdir(self.project_path):
+            for task in tasks.run().values():
+                LOG.info(f'{task}')
+
+    def publish_all(self, members: list['Project']):
+        """Uploads monorepo data to remote VCS and members packages to Python Package Index server.
+        Distributions are built in parallel.
+
+        :param members: Members to publish.
+
+        """
+        LOG.info(f'Publishing {len(members)} application(s) ...')
+
+        tasks = TaskGraph()
+        tasks.add('push', self.vcs.push)
+
+        for member in members:
+            name = member.name
+            tasks.add(f'build-{name}', partial(DistHelper.build, member.project_path))
+            tasks.add(
+                f'upload-{name}',
+                partial(DistHelper.publish, member.project_path),
+                deps=['push', f'build-{name}'],
+            )
+
         with chdir(self.project_path):
-            self.vcs.push()
-            DistHelper.upload()
+            for task in tasks.run().values():
+                LOG.info(f'{task}')
 
     def run_tests(self, *, only: list[str] | None = None) -> dict[str, list[str]]:
         LOG.info('Running tests ...')
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
+import json
 import logging
 import sys
 from pathlib import Path
+from time import perf_counter
 
 import click
+from jinja2 import Environment
 
 from makeapp.helpers.tests import TestsHelper
 
@@ -12,7 +15,12 @@ from .exceptions import MakeappException
 try:
     from . import VERSION
     from .appmaker import AppMaker
+    from .apptemplate import TemplatePack
     from .apptools import VERSION_NUMBER_CHUNKS, Project
+    from .fleet import Fleet
+    from .names import IndexSnapshot
+    from .rendering import RenderCache, Renderer
+    from .utils import configure_logging
 
 except MakeappException as e:
     click.secho(f'{e}', err=True, fg='red')
@@ -62,11 +70,17 @@ def entry_point():
 @click.option(
     '--no-prompt', is_flag=True,
     help='Do not prompt')
+@click.option(
+    '--staged', is_flag=True,
+    help='Render all files into a staging directory first and then move them into place at once')
 @click.option(
     '-t', '--templates_to_use',
     help='Accepts comma separated list of application structures templates names or paths')
 @click.argument('custom_args', nargs=-1, type=click.UNPROCESSED)
-def new(app_name, target_path, configuration_file, overwrite_on_conflict, debug, custom_args, no_prompt, **kwargs):
+def new(
+        app_name, target_path, configuration_file, overwrite_on_conflict, debug, custom_args, no_prompt, staged,
+        **kwargs
+):
     """Simplifies Python application rollout providing its basic structure."""
 
     def process_custom_args(args):
@@ -141,6 +155,7 @@ def new(app_name, target_path, configuration_file, overwrite_on_conflict, debug,
         init_venv=init_venv,
         remote_address=remote_address,
         remote_push=remote_push,
+        staged=staged,
     )
     click.secho('Done', fg='green')
 
@@ -150,13 +165,21 @@ def new(app_name, target_path, configuration_file, overwrite_on_conflict, debug,
     '-i', '--increment',
     help='Version number chunk to increment', type=click.Choice(VERSION_NUMBER_CHUNKS)
 )
+@click.option(
+    '-a', '--all', 'all_', is_flag=True,
+    help='Release all monorepo members (subdirectories with their own pyproject.toml and changelog)'
+)
 @option_debug
-def release(increment, debug):
+def release(increment, all_, debug):
     """Performs new application version release."""
     project = Project(log_level=logging.DEBUG if debug else logging.INFO)
 
     project.pull()
 
+    if all_:
+        release_all(project, increment)
+        return
+
     version_str, version_summary = project.get_release_info(increment)
 
     if not version_summary:
@@ -176,6 +199,27 @@ def release(increment, debug):
     click.secho('Done', fg='green')
 
 
+def release_all(project: Project, increment: str | None):
+    releases = project.get_release_info_all(increment)
+
+    if not releases:
+        click.secho('No changes found in members changelogs. Please add changes before release', fg='red', err=True)
+        sys.exit(1)
+
+    for member, (_, version_summary) in releases.items():
+        package = member.package
+        click.secho(f'{member.name}: {package.version_current_str} -> {package.version_next_str}', fg='green')
+        click.secho(version_summary)
+
+    if click.confirm('Commit changes?', default=True):
+        project.release_all(releases)
+
+        if click.confirm('Publish to remotes?', default=True):
+            project.publish_all(list(releases))
+
+    click.secho('Done', fg='green')
+
+
 @entry_point.command()
 @option_debug
 def publish(debug):
@@ -187,6 +231,22 @@ def publish(debug):
     click.secho('Done', fg='green')
 
 
+@entry_point.command()
+@option_debug
+@click.option(
+    '-f', '--force',
+    help='Rebuild even if cached artifacts are available', is_flag=True
+)
+def build(debug, force):
+    """Builds distribution artifacts to be published later."""
+    project = Project(log_level=logging.DEBUG if debug else logging.INFO)
+
+    for artifact in project.build(force=force):
+        click.secho(f'{artifact}')
+
+    click.secho('Done', fg='green')
+
+
 @entry_point.command()
 @option_debug
 @click.argument('description', nargs=-1)
@@ -196,6 +256,107 @@ def change(debug, description):
     click.secho('Done', fg='green')
 
 
+@entry_point.group()
+def changelog():
+    """Changelog related commands."""
+
+
+@changelog.command()
+@option_debug
+@click.argument('version', required=False)
+@click.option(
+    '-s', '--since',
+    help='Show all versions following the given one')
+@click.option(
+    '--json', 'as_json', is_flag=True,
+    help='Output in JSON format')
+def show(debug, version, since, as_json):
+    """Shows changelog entries for a version (the latest by default)."""
+    project = Project(log_level=logging.DEBUG if debug else logging.INFO)
+    sections = project.get_changelog_sections(version, since=since)
+
+    if as_json:
+        click.echo(json.dumps([section.as_dict() for section in sections], indent=2, ensure_ascii=False))
+
+    else:
+        click.echo('\n\n'.join(map(str, sections)))
+
+
+@entry_point.group()
+def templates():
+    """Application templates related commands."""
+
+
+@templates.command()
+@click.argument('path', type=click.Path(exists=True, file_okay=False))
+@click.option(
+    '-o', '--output', type=click.Path(dir_okay=False),
+    help='Pack file path. Default: <template name>.mapack')
+def pack(path, output):
+    """Packs a template directory into a single precompiled file usable with -t."""
+    target = TemplatePack.create(path, output, environment=Environment(**Renderer.env_options))
+    click.secho(f'Template pack created: {target}', fg='green')
+
+
+@entry_point.group()
+def cache():
+    """Render cache related commands."""
+
+
+@cache.command(name='show')
+def cache_show():
+    """Shows render cache location and usage."""
+    render_cache = RenderCache()
+    size = render_cache.size
+
+    click.echo(f'Path: {render_cache.path}')
+    click.echo(f'Entries: {render_cache.count}')
+    click.echo(f'Size: {size / 1024:.1f} KB of {render_cache.max_size / 1024:.1f} KB')
+
+
+@cache.command(name='clear')
+def cache_clear():
+    """Removes all render cache entries."""
+    freed = RenderCache().clear()
+    click.secho(f'Render cache cleared: {freed / 1024:.1f} KB freed', fg='green')
+
+
+@entry_point.group()
+def names():
+    """Application names related commands."""
+
+
+@names.command()
+@option_debug
+@click.argument('candidates', type=click.File())
+@click.option(
+    '-i', '--index', default=IndexSnapshot.url_default, show_default=True,
+    help='Package index (simple API) URL or a local mirror path')
+@click.option(
+    '-u', '--update', is_flag=True,
+    help='Update local index snapshot before checking')
+def check(debug, candidates, index, update):
+    """Checks names from a file (one per line, - for stdin) against a local package index snapshot."""
+    configure_logging(logging.DEBUG if debug else logging.INFO)
+
+    snapshot = IndexSnapshot(index)
+
+    if update or not snapshot.exists:
+        snapshot.update()
+
+    for line in candidates:
+        name = line.strip()
+
+        if not name or name.startswith('#'):
+            continue
+
+        if name in snapshot:
+            click.secho(f'{name}: in use', fg='red')
+
+        else:
+            click.secho(f'{name}: available', fg='green')
+
+
 @entry_point.command()
 @option_debug
 @click.option(
@@ -268,6 +429,42 @@ def docs(debug, build):
     click.secho('Done', fg='green')
 
 
+@entry_point.command(context_settings={'ignore_unknown_options': True})
+@option_debug
+@click.argument('command', type=click.Choice(Fleet.commands))
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+@click.option(
+    '-r', '--repos', type=click.Path(exists=True, dir_okay=False), required=True,
+    help='File with repositories paths, one per line')
+@click.option(
+    '-j', '--jobs', type=int,
+    help='Number of repositories to process concurrently. Default: number of CPUs')
+@click.option(
+    '-x', '--fail-fast', is_flag=True,
+    help='Stop on the first failure')
+@click.option(
+    '-l', '--logs', type=click.Path(file_okay=False),
+    help='Directory for per repository logs. Default: .makeapp/fleet')
+def fleet(debug, command, args, repos, jobs, fail_fast, logs):
+    """Runs a command (e.g. tests, style, up, change) across many repositories concurrently."""
+    configure_logging(logging.DEBUG if debug else logging.INFO)
+
+    fleet_ = Fleet(Fleet.read_repos(repos), jobs=jobs, log_dir=logs)
+
+    def on_result(result):
+        click.secho(f'{result}', fg='green' if result.ok else 'red')
+
+    started = perf_counter()
+    results = fleet_.run(command, args, fail_fast=fail_fast, on_result=on_result)
+
+    click.secho(Fleet.get_report(results, duration=perf_counter() - started))
+
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+    click.secho('Done', fg='green')
+
+
 def main():
     try:
         entry_point(obj={})
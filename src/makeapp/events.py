@@ -0,0 +1,237 @@
+import logging
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from threading import Lock
+
+LOG = logging.getLogger(__name__)
+
+
+class Event:
+    """Base for instrumentation events."""
+
+    __slots__ = []
+
+    name: str = ''
+    """Event type name."""
+
+    def __repr__(self):
+        attrs = ', '.join(f'{attr}={getattr(self, attr)!r}' for attr in self.__slots__)
+        return f'{self.__class__.__name__}({attrs})'
+
+    def as_dict(self) -> dict:
+        return {'event': self.name, **{attr: getattr(self, attr) for attr in self.__slots__}}
+
+
+class TemplateLoaded(Event):
+    """Application template is loaded."""
+
+    __slots__ = ['duration', 'path', 'template']
+
+    name = 'template_loaded'
+
+    def __init__(self, template: str, *, path: str, duration: float):
+        """
+        :param template: Template name.
+        :param path: Template path.
+        :param duration: Time spent in seconds.
+
+        """
+        self.template = template
+        self.path = path
+        self.duration = duration
+
+
+class HookStarted(Event):
+    """Application template hook is started."""
+
+    __slots__ = ['hook', 'template']
+
+    name = 'hook_started'
+
+    def __init__(self, hook: str, *, template: str):
+        """
+        :param hook: Hook name, e.g. rollout_post.
+        :param template: Template name.
+
+        """
+        self.hook = hook
+        self.template = template
+
+
+class HookFinished(Event):
+    """Application template hook is finished."""
+
+    __slots__ = ['duration', 'error', 'hook', 'template']
+
+    name = 'hook_finished'
+
+    def __init__(self, hook: str, *, template: str, duration: float, error: Exception | None = None):
+        """
+        :param hook: Hook name, e.g. rollout_post.
+        :param template: Template name.
+        :param duration: Time spent in seconds.
+        :param error: Exception raised by the hook.
+
+        """
+        self.hook = hook
+        self.template = template
+        self.duration = duration
+        self.error = error
+
+
+class FileRendered(Event):
+    """Template file is rendered."""
+
+    __slots__ = ['cached', 'duration', 'size', 'template']
+
+    name = 'file_rendered'
+
+    def __init__(self, template: str, *, size: int, duration: float, cached: bool):
+        """
+        :param template: Template file name or path.
+        :param size: Rendered contents size in bytes.
+        :param duration: Time spent in seconds.
+        :param cached: Whether the result is taken from render cache.
+
+        """
+        self.template = template
+        self.size = size
+        self.duration = duration
+        self.cached = cached
+
+
+class SubprocessStarted(Event):
+    """Shell command is started."""
+
+    __slots__ = ['command']
+
+    name = 'subprocess_started'
+
+    def __init__(self, command: str):
+        """
+        :param command:
+
+        """
+        self.command = command
+
+
+class SubprocessFinished(Event):
+    """Shell command is finished."""
+
+    __slots__ = ['command', 'duration', 'returncode']
+
+    name = 'subprocess_finished'
+
+    def __init__(self, command: str, *, returncode: int | None, duration: float):
+        """
+        :param command:
+        :param returncode: Process exit code. None if the process failed to start or to finish.
+        :param duration: Time spent in seconds.
+
+        """
+        self.command = command
+        self.returncode = returncode
+        self.duration = duration
+
+
+class VcsOp(Event):
+    """VCS operation is performed."""
+
+    __slots__ = ['command', 'duration', 'error', 'vcs']
+
+    name = 'vcs_op'
+
+    def __init__(self, command: str, *, vcs: str, duration: float, error: Exception | None = None):
+        """
+        :param command: VCS command, e.g. `commit -F -`.
+        :param vcs: VCS alias, e.g. git.
+        :param duration: Time spent in seconds.
+        :param error: Exception raised.
+
+        """
+        self.command = command
+        self.vcs = vcs
+        self.duration = duration
+        self.error = error
+
+
+Listener = Callable[[Event], None]
+
+
+class Events:
+    """Instrumentation events dispatcher.
+
+    Emitters are expected to check the dispatcher for truth before
+    constructing an event (and measuring time), so instrumentation
+    costs nothing when no listener is attached:
+
+        if EVENTS:
+            EVENTS.emit(SubprocessStarted(command))
+
+    Listeners are called synchronously in the emitting thread
+    (hooks may be run in worker threads). Exceptions raised by
+    listeners are logged and do not affect the emitter.
+
+    """
+    __slots__ = ['_listeners', '_lock']
+
+    def __init__(self):
+        self._listeners: tuple[tuple[Listener, tuple[type[Event], ...]], ...] = ()
+        self._lock = Lock()
+
+    def __bool__(self):
+        return bool(self._listeners)
+
+    def subscribe(self, listener: Listener, *event_types: type[Event]) -> Callable[[], None]:
+        """Attaches a listener. Returns a callable to detach it.
+
+        :param listener: Callable accepting an event object.
+        :param event_types: Event classes to listen to. Default: all events.
+
+        """
+        entry = (listener, event_types or (Event,))
+
+        with self._lock:
+            self._listeners = (*self._listeners, entry)
+
+        def unsubscribe():
+            with self._lock:
+                self._listeners = tuple(item for item in self._listeners if item is not entry)
+
+        return unsubscribe
+
+    @contextmanager
+    def listening(self, listener: Listener, *event_types: type[Event]) -> Generator[None, None, None]:
+        """Context manager to attach a listener temporarily.
+
+        :param listener: Callable accepting an event object.
+        :param event_types: Event classes to listen to. Default: all events.
+
+        """
+        unsubscribe = self.subscribe(listener, *event_types)
+
+        try:
+            yield
+
+        finally:
+            unsubscribe()
+
+    def emit(self, event: Event):
+        """Passes the event to listeners.
+
+        :param event:
+
+        """
+        # Listeners tuple is replaced (not mutated) on changes, so no lock is required.
+        for listener, event_types in self._listeners:
+
+            if isinstance(event, event_types):
+                try:
+                    listener(event)
+
+                except Exception:
+                    LOG.exception(f'Events listener {listener!r} failed on {event!r}')
+
+
+EVENTS = Events()
+"""Process-wide events dispatcher. Also available as AppMaker.events and Project.events."""
@@ -14,3 +14,7 @@ class ProjectorExeption(MakeappException):
 
 class CommandError(MakeappException):
     """Raised when projector detects external process invocation error."""
+
+
+class TaskError(MakeappException):
+    """Raised when one or more tasks of a task graph fail."""
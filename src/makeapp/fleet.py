@@ -0,0 +1,256 @@
+import logging
+import os
+import sys
+from collections.abc import Callable, Generator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import chdir, contextmanager
+from pathlib import Path
+from time import perf_counter
+from typing import IO
+
+from .apptools import CACHE_DIRNAME, Project
+from .exceptions import ProjectorExeption
+from .helpers.tests import TestsHelper
+
+LOG = logging.getLogger(__name__)
+
+
+class FleetResult:
+    """Result of a command run for a repository."""
+
+    STATUS_OK = 'ok'
+    STATUS_FAIL = 'failed'
+    STATUS_SKIP = 'skipped'
+
+    __slots__ = ['duration', 'error', 'log_path', 'path', 'status']
+
+    def __init__(self, path: Path, *, status: str, log_path: Path, duration: float = 0.0, error: str = ''):
+        """
+        :param path: Repository path.
+        :param status: Run status.
+        :param log_path: Path to the log file with run output.
+        :param duration: Run duration in seconds.
+        :param error: Error description.
+
+        """
+        self.path = path
+        self.status = status
+        self.log_path = log_path
+        self.duration = duration
+        self.error = error
+
+    def __str__(self):
+        details = f' ({self.error})' if self.error else ''
+        return f'{self.path}: {self.status} [{self.duration:.2f}s]{details}'
+
+    @property
+    def ok(self) -> bool:
+        return self.status == self.STATUS_OK
+
+
+@contextmanager
+def redirect_output(target: IO) -> Generator[None, None, None]:
+    """Redirects stdout and stderr of the current process (including child processes) to a file.
+
+    :param target:
+
+    """
+    streams = {1: sys.stdout, 2: sys.stderr}
+    saved = {}
+
+    for fd, stream in streams.items():
+        stream.flush()
+        saved[fd] = os.dup(fd)
+        os.dup2(target.fileno(), fd)
+
+    try:
+        yield
+
+    finally:
+        for fd, stream in streams.items():
+            stream.flush()
+            os.dup2(saved[fd], fd)
+            os.close(saved[fd])
+
+
+def run_command_tests(project: Project, args: tuple[str, ...]):
+    stats = project.run_tests(only=list(args))
+
+    if failed := stats[TestsHelper.KEY_FAIL]:
+        raise ProjectorExeption(f"Tests failed: {' '.join(failed)}")
+
+
+COMMANDS: dict[str, Callable[[Project, tuple[str, ...]], None]] = {
+    'change': lambda project, args: project.add_change(args),
+    'style': lambda project, args: project.style(),
+    'tests': run_command_tests,
+    'up': lambda project, args: project.venv_init(),
+}
+"""Project operations available in fleet mode: command name -> callable(project, args)."""
+
+
+def run_in_repo(command: str, path: Path, args: tuple[str, ...], log_path: Path) -> FleetResult:
+    """Runs a command for a repository. Executed in a worker process.
+
+    :param command: Command name. See COMMANDS.
+    :param path: Repository path.
+    :param args: Command arguments.
+    :param log_path: File to write command output to.
+
+    """
+    started = perf_counter()
+    status = FleetResult.STATUS_OK
+    error = ''
+
+    with log_path.open('w') as log, redirect_output(log):
+
+        try:
+            with chdir(path):
+                COMMANDS[command](Project(log_level=logging.INFO), args)
+
+        except Exception as e:
+            LOG.exception(f'{command} failed for {path}')
+            status = FleetResult.STATUS_FAIL
+            error = (f'{e}'.strip().splitlines() or [e.__class__.__name__])[-1]
+
+    return FleetResult(path, status=status, log_path=log_path, duration=perf_counter() - started, error=error)
+
+
+class Fleet:
+    """Runs project commands across many repositories concurrently
+    in a process pool, with per-repository logs.
+
+    """
+    commands = tuple(sorted(COMMANDS))
+
+    def __init__(self, repos: list[Path], *, jobs: int | None = None, log_dir: Path | None = None):
+        """
+        :param repos: Repositories paths.
+        :param jobs: Number of worker processes. Default: number of CPUs.
+        :param log_dir: Directory to write per repository logs into.
+
+        """
+        self.repos = [Path(repo).absolute() for repo in repos]
+        self.jobs = jobs
+        self.log_dir = Path(log_dir or Path(CACHE_DIRNAME, 'fleet')).absolute()
+
+    @classmethod
+    def read_repos(cls, fpath: Path) -> list[Path]:
+        """Reads repositories paths from a file: one per line.
+        Empty lines and lines starting with # are skipped.
+
+        :param fpath:
+
+        """
+        repos = []
+
+        for line in Path(fpath).read_text().splitlines():
+            line = line.strip()
+
+            if line and not line.startswith('#'):
+                repos.append(Path(line).expanduser())
+
+        return repos
+
+    def get_log_path(self, idx: int, repo: Path) -> Path:
+        return self.log_dir / f'{idx:03}_{repo.name}.log'
+
+    def run(
+            self,
+            command: str,
+            args: tuple[str, ...] = (),
+            *,
+            fail_fast: bool = False,
+            on_result: Callable[[FleetResult], None] | None = None
+    ) -> list[FleetResult]:
+        """Runs a command for every repository. Returns results in repositories order.
+
+        :param command: Command name. See COMMANDS.
+        :param args: Command arguments.
+        :param fail_fast: Do not start new runs after the first failure.
+        :param on_result: Callable to be called for every result as soon as it's available.
+
+        """
+        if command not in COMMANDS:
+            raise ProjectorExeption(f'Unsupported fleet command `{command}`. Should be one of: {self.commands}.')
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        LOG.info(f'Running `{command}` for {len(self.repos)} repositories ...')
+
+        results = {}
+
+        with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+
+            running = {
+                pool.submit(run_in_repo, command, repo, tuple(args), self.get_log_path(idx, repo)): idx
+                for idx, repo in enumerate(self.repos)
+            }
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    idx = running.pop(future)
+
+                    if future.cancelled():
+                        continue
+
+                    if error := future.exception():
+                        # Worker process failure.
+                        repo = self.repos[idx]
+                        result = FleetResult(
+                            repo,
+                            status=FleetResult.STATUS_FAIL,
+                            log_path=self.get_log_path(idx, repo),
+                            error=f'{error}',
+                        )
+
+                    else:
+                        result = future.result()
+
+                    results[idx] = result
+
+                    if on_result:
+                        on_result(result)
+
+                    if fail_fast and not result.ok:
+                        for pending in running:
+                            pending.cancel()
+
+        for idx, repo in enumerate(self.repos):
+            if idx not in results:
+                results[idx] = FleetResult(repo, status=FleetResult.STATUS_SKIP, log_path=self.get_log_path(idx, repo))
+
+        return [results[idx] for idx in sorted(results)]
+
+    @classmethod
+    def get_report(cls, results: list[FleetResult], *, duration: float | None = None) -> str:
+        """Returns aggregated report for the given results.
+
+        :param results:
+        :param duration: Overall run duration.
+
+        """
+        counts = {}
+
+        for result in results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+
+        total = sum(result.duration for result in results)
+        slowest = sorted((result for result in results if result.duration), key=lambda result: -result.duration)[:5]
+
+        lines = [
+            f'Repositories: {len(results)} ({", ".join(f"{status}: {count}" for status, count in counts.items())})',
+            f'Time: {total:.2f}s total' + (f', {duration:.2f}s wall' if duration is not None else ''),
+        ]
+
+        if slowest:
+            lines.append('Slowest:')
+            lines.extend(f'  {result.path}: {result.duration:.2f}s' for result in slowest)
+
+        if failed := [result for result in results if result.status == FleetResult.STATUS_FAIL]:
+            lines.append('Failed:')
+            lines.extend(f'  {result} see {result.log_path}' for result in failed)
+
+        return '\n'.join(lines)
@@ -1,3 +1,9 @@
+import hashlib
+import json
+import os
+import tomllib
+from pathlib import Path
+from shlex import quote
 from shutil import rmtree
 
 from ..utils import LOG, check_command, get_user_dir, read_ini, run_command
@@ -8,16 +14,129 @@ class DistHelper:
 
     check_command('uv', hint='uv')
 
+    dist_dirname = 'dist'
+
+    manifest_filename = '.makeapp.json'
+    """Build manifest (build hash and artifacts) placed next to artifacts."""
+
+    tree_exclude = frozenset({'dist', 'build', 'site', '__pycache__'})
+    """Directories not considered a part of a source tree (in addition to hidden ones)."""
+
     @classmethod
     def run_command_uv(cls, command: str, *, env: dict = None) -> list[str]:
         """Basic command runner."""
         return run_command(f'uv {command}', env=env)
 
     @classmethod
-    def upload(cls):
-        """Builds a package and uploads it to PyPI."""
+    def get_dist_dir(cls, path: Path | None = None) -> Path:
+        """Returns distribution artifacts directory for a project.
+
+        :param path: Project directory. Default: current directory.
+
+        """
+        return (path or Path()) / cls.dist_dirname
+
+    @classmethod
+    def get_build_hash(cls, path: Path | None = None) -> str:
+        """Returns a hash of the project source tree,
+        project version and build backend configuration.
+
+        :param path: Project directory. Default: current directory.
+
+        """
+        path_src = path or Path()
+        hasher = hashlib.sha256()
+
+        pyproject = path_src / 'pyproject.toml'
+        if pyproject.exists():
+            data = tomllib.loads(pyproject.read_text())
+            build_config = {
+                'version': data.get('project', {}).get('version'),
+                'build-system': data.get('build-system'),
+            }
+            hasher.update(json.dumps(build_config, sort_keys=True).encode())
+
+        exclude = cls.tree_exclude
+
+        for dirpath, dirs, files in os.walk(path_src):
+            dirs[:] = sorted(name for name in dirs if name not in exclude and not name.startswith('.'))
+
+            for fname in sorted(files):
+
+                if fname.endswith('.pyc'):
+                    continue
+
+                fpath = Path(dirpath, fname)
+
+                with fpath.open('rb') as f:
+                    digest = hashlib.file_digest(f, 'sha256').digest()
+
+                hasher.update(f'{fpath.relative_to(path_src).as_posix()}\0'.encode())
+                hasher.update(digest)
+
+        return hasher.hexdigest()
+
+    @classmethod
+    def _get_cached(cls, build_hash: str, *, dist_dir: Path) -> list[Path] | None:
+        """Returns cached artifacts paths for the given build hash, if any.
+
+        :param build_hash:
+        :param dist_dir:
 
-        rmtree('dist/', ignore_errors=True)  # cleanup
+        """
+        try:
+            manifest = json.loads((dist_dir / cls.manifest_filename).read_text())
+
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get('hash') != build_hash:
+            return None
+
+        artifacts = [dist_dir / fname for fname in manifest.get('artifacts', [])]
+
+        if not artifacts or not all(artifact.exists() for artifact in artifacts):
+            return None
+
+        return artifacts
+
+    @classmethod
+    def build(cls, path: Path | None = None, *, force: bool = False) -> list[Path]:
+        """Builds a package. Returns artifacts paths.
+
+        Artifacts built previously from the same source tree are reused.
+
+        :param path: Project directory. Default: current directory.
+        :param force: Rebuild even if cached artifacts are available.
+
+        """
+        dist_dir = cls.get_dist_dir(path)
+        build_hash = cls.get_build_hash(path)
+
+        if not force and (artifacts := cls._get_cached(build_hash, dist_dir=dist_dir)):
+            LOG.info(f'Reusing cached build artifacts: {", ".join(artifact.name for artifact in artifacts)}')
+            return artifacts
+
+        rmtree(dist_dir, ignore_errors=True)  # cleanup
+        cls.run_command_uv(f'build {quote(f"{path}")} --out-dir {quote(f"{dist_dir}")}' if path else 'build')
+
+        artifacts = sorted(item for item in dist_dir.glob('*') if item.name.endswith(('.whl', '.tar.gz')))
+
+        if artifacts:
+            (dist_dir / cls.manifest_filename).write_text(json.dumps({
+                'hash': build_hash,
+                'artifacts': [artifact.name for artifact in artifacts],
+            }))
+
+        return artifacts
+
+    @classmethod
+    def publish(cls, path: Path | None = None):
+        """Uploads a built package to PyPI.
+
+        :param path: Project directory. Default: current directory.
+
+        """
 
         pypirc_file = get_user_dir() / '.pypirc'
         env_vars = None
@@ -32,5 +151,10 @@ class DistHelper:
         if not env_vars:
             LOG.warning(f'PyPI credentials not found in {pypirc_file}')
 
-        cls.run_command_uv('build')
-        cls.run_command_uv('publish', env=env_vars)
+        cls.run_command_uv(f'publish {quote(f"{cls.get_dist_dir(path)}")}/*' if path else 'publish', env=env_vars)
+
+    @classmethod
+    def upload(cls):
+        """Builds a package and uploads it to PyPI."""
+        cls.build()
+        cls.publish()
@@ -1,6 +1,9 @@
 import logging
-from collections.abc import Generator
+import os
+import shutil
+from collections.abc import Callable, Generator
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 
 LOG = logging.getLogger(__name__)
 
@@ -8,10 +11,19 @@ LOG = logging.getLogger(__name__)
 class FileHelper:
     """Encapsulates file related functions."""
 
-    def __init__(self, filepath: Path | str, line_idx, contents):
+    def __init__(self, filepath: Path | str, line_idx, contents, *, head_size: int | None = None):
+        """
+        :param filepath:
+        :param line_idx:
+        :param contents:
+        :param head_size: Size in bytes of the file head represented by `contents`.
+            If not set `contents` represent the whole file.
+
+        """
         self.filepath = filepath
         self.line_idx = line_idx
         self.contents = contents
+        self.head_size = head_size
 
     @classmethod
     def read_file(cls, fpath: str | Path) -> list[str]:
@@ -20,18 +32,145 @@ class FileHelper:
         :param fpath: File path
 
         """
-        with open(fpath) as f:
+        with Path(fpath).open() as f:
             data = f.read().splitlines()
 
         return data
 
+    @classmethod
+    def read_head(
+            cls,
+            fpath: str | Path,
+            *,
+            until: Callable[[int, str], bool] | None = None,
+            size: int | None = None
+    ) -> tuple[list[str], int | None]:
+        """Reads lines from the beginning of a file up to (including) the line
+        for which `until` returns True or the given number of bytes.
+        The rest of the file is not read.
+
+        Returns a tuple (lines, head_size), where head_size is the size in bytes
+        of the read region or None if the whole file has been read.
+
+        :param fpath: File path
+        :param until: Callable accepting line index and line.
+        :param size: Known head size in bytes. Head should end with a newline.
+
+        """
+        lines = []
+
+        with Path(fpath).open('rb') as f:
+
+            if size is not None:
+                head = f.read(size).decode()
+
+                if not head.endswith('\n'):
+                    raise ValueError(f'Unexpected head size {size} for {fpath}')
+
+                lines = [line.rstrip('\r') for line in head[:-1].split('\n')]
+                return lines, size
+
+            for idx, line in enumerate(f):
+                line = line.decode().rstrip('\r\n')
+                lines.append(line)
+
+                if until(idx, line):
+                    head_size = f.tell()
+
+                    if f.read(1):
+                        return lines, head_size
+
+                    break
+
+        return lines, None
+
     def write(self):
-        """Writes updated contents back to a file."""
+        """Writes updated contents back to a file.
+
+        If only the file head is represented by contents, the head is rewritten
+        in place (when its size is unchanged) or spliced with the untouched tail.
+
+        """
+        filepath = Path(self.filepath)
+        head_size = self.head_size
+
+        LOG.debug(f'Writing `{filepath}` ...')
+
+        head = '\n'.join(self.contents)
+
+        if head_size is None:
+            with filepath.open('w') as f:
+                f.write(head)
+            return
+
+        head = f'{head}\n'.encode()
+
+        if len(head) == head_size:
+            with filepath.open('r+b') as f:
+                f.write(head)
+
+        else:
+            self._splice(filepath, head, tail_offset=head_size)
+
+        self.head_size = len(head)
+
+    @classmethod
+    def _splice(cls, filepath: Path, head: bytes, *, tail_offset: int):
+        """Replaces file contents before `tail_offset` with `head`
+        using a temporary file atomically moved into place.
 
-        LOG.debug(f'Writing `{self.filepath}` ...')
+        :param filepath:
+        :param head:
+        :param tail_offset:
 
-        with open(self.filepath, 'w') as f:
-            f.write('\n'.join(self.contents))
+        """
+        with NamedTemporaryFile(dir=filepath.parent, prefix=f'.{filepath.name}.', delete=False) as dst:
+            try:
+                dst.write(head)
+                dst.flush()
+
+                with filepath.open('rb') as src:
+                    cls._copy_tail(src, dst, offset=tail_offset)
+
+                shutil.copymode(filepath, dst.name)
+
+            except BaseException:
+                Path(dst.name).unlink(missing_ok=True)
+                raise
+
+        Path(dst.name).replace(filepath)
+
+    @staticmethod
+    def _copy_tail(src, dst, *, offset: int):
+        """Copies `src` file contents starting from `offset` to the end of `dst` file.
+        Uses in-kernel copy where available.
+
+        :param src:
+        :param dst:
+        :param offset:
+
+        """
+        remaining = os.fstat(src.fileno()).st_size - offset
+
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining, offset)
+                    if not copied:
+                        break
+                    offset += copied
+                    remaining -= copied
+
+            except OSError:
+                pass  # Not supported by FS. Fallback to userspace copy.
+
+            else:
+                if remaining <= 0:
+                    return
+
+        src.seek(offset)
+        dst.seek(0, os.SEEK_END)
+        shutil.copyfileobj(src, dst)
 
     def line_replace(self, value: str, offset: int = 0):
         """Replaces a line in file.
@@ -1,7 +1,11 @@
 import os
+import re
+import shlex
 from pathlib import Path
-from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import ClassVar
 
+from ..events import EVENTS, VcsOp
 from ..exceptions import CommandError, ProjectorExeption
 from ..utils import run_command
 
@@ -14,7 +18,7 @@ class VcsHelper:
     branch_master = 'master'
     branch_upstream = 'origin'
 
-    registry: dict[str, type['VcsHelper']] = {}
+    registry: ClassVar[dict[str, type['VcsHelper']]] = {}
 
     def __init_subclass__(cls):
         alias = cls.alias
@@ -24,8 +28,28 @@ class VcsHelper:
 
         super().__init_subclass__()
 
-    def __init__(self):
+    def __init__(self, path: str | Path | None = None):
+        """
+        :param path: Repository dir. Default: current working dir.
+
+        """
         self.remote = None
+        self.path = Path(path) if path else None
+        self._cache = {}
+
+    def _cached(self, key: str, func):
+        """Returns cached repository information, calling `func` to get it on first access.
+
+        :param key:
+        :param func:
+
+        """
+        cache = self._cache
+
+        if key not in cache:
+            cache[key] = func()
+
+        return cache[key]
 
     @classmethod
     def get(cls, vcs_path: str | None = None) -> 'VcsHelper':
@@ -40,17 +64,44 @@ class VcsHelper:
 
         for helper_cls in cls.registry.values():
             if os.path.exists(os.path.join(vcs_path, f'.{helper_cls.alias}')):
-                helper = helper_cls()
+                helper = helper_cls(vcs_path)
                 break
 
         return helper
 
-    def run_command(self, command: str):
-        """Basic command runner to implement."""
-        return run_command(f'{self.alias} {command}')
+    def run_command(self, command: str, *, input: str | None = None):
+        """Basic command runner to implement.
+
+        :param command:
+        :param input: Data to pass to command's stdin.
+
+        """
+        if not EVENTS:
+            return run_command(f'{self.alias} {command}', input=input)
+
+        started = perf_counter()
+        error = None
+
+        try:
+            return run_command(f'{self.alias} {command}', input=input)
+
+        except Exception as e:
+            error = e
+            raise
+
+        finally:
+            EVENTS.emit(VcsOp(command, vcs=self.alias, duration=perf_counter() - started, error=error))
+
+    @staticmethod
+    def _quote_paths(paths: list[str] | str | list[Path] | Path) -> str:
+        if not isinstance(paths, list):
+            paths = [paths]
+
+        return ' '.join(shlex.quote(f'{path}') for path in paths)
 
     def init(self):
         """Initializes a repository."""
+        self._cache.clear()
         return self.run_command('init -q')
 
     def get_modified(self) -> list[str]:
@@ -66,11 +117,19 @@ class VcsHelper:
 
         return modified
 
+    def get_branch(self) -> str | None:
+        """Returns current branch name."""
+
+        for line in self.run_command('branch'):
+            if line.startswith('* '):
+                return line[2:]
+
+        return None
+
     def check(self):
         """Performs basic vcs check."""
-        data = self.run_command('branch')
 
-        if f'* {self.branch_master}' not in ''.join(data):
+        if self.get_branch() != self.branch_master:
             raise ProjectorExeption(
                 f'VCS needs to be initialized and branch set to `{self.branch_master}`')
 
@@ -82,35 +141,49 @@ class VcsHelper:
         :param overwrite: Whether to overwrite tag if exists.
 
         """
-        overwrite = '-f' if overwrite else ''
+        overwrite = ' -f' if overwrite else ''
 
-        with NamedTemporaryFile() as f:
-            f.write(description.encode())
-            f.flush()
-
-            self.run_command(f'tag {name} {overwrite} -F {f.name}')
+        self.run_command(f'tag {shlex.quote(name)}{overwrite} -F -', input=description)
 
     def add(self, filename: list[str] | str | list[Path] | Path = None):
-        """Adds a file into a changelist.
+        """Adds a file (or many at once) into a changelist.
 
         :param filename: If not provided all files in working tree are added.
 
         """
-        filename = filename or []
-        if isinstance(filename, list):
-            filename = ' '.join(map(str, filename))
-
-        filename = f'{filename}'.strip() or ''
+        filename = self._quote_paths(filename) if filename else ''
 
-        self.run_command(f'add {filename}')
+        self.run_command(f'add {filename}'.strip())
 
-    def commit(self, message: str):
+    def commit(
+            self,
+            message: str,
+            *,
+            files: list[str] | list[Path] | None = None,
+            all_modified: bool = False
+    ):
         """Commits files added to changelist.
 
         :param message: Commit description.
+        :param files: Files to add into changelist and commit at once.
+        :param all_modified: Whether to add all modified files into changelist and commit at once.
+            Files given in `files` are committed even if they are not tracked yet.
 
         """
-        self.run_command("commit -m '%s'" % message.replace("'", "''"))
+        command = 'commit -F -'
+
+        if all_modified:
+
+            command = f'{command} -a'
+
+            if files:
+                # `-a` stages only tracked files. Chained to keep a single process spawn.
+                command = f'add -- {self._quote_paths(files)} && {self.alias} {command}'
+
+        elif files:
+            command = f'{command} -i -- {self._quote_paths(files)}'
+
+        self.run_command(command, input=message)
 
     def get_remotes(self):
         """Returns a list of remotes."""
@@ -135,24 +208,142 @@ class VcsHelper:
 
         """
         self.remote = address
+        self._cache.clear()
 
     def push(self, *, upstream: bool | str = None):
-        """Pushes local changes and tags to remote.
+        """Pushes local changes and tags to remote atomically, at once.
         
         :param upstream: Upstream alias. If True, default name is used.
 
         """
+        command = 'push --atomic --follow-tags'
+
         if upstream:
 
             if upstream is True:
                 upstream = self.branch_upstream
 
-            self.run_command(f'push -u {upstream} {self.branch_master}')
+            command = f'{command} -u {upstream} {self.branch_master}'
+
+        self.run_command(command)
+
+
+class GitRepository:
+    """Reads Git repository information (branch, refs, remotes)
+    right from repository files without spawning git processes.
+
+    """
+    _re_section = re.compile(r'^\s*\[\s*([\w.-]+)(?:\s+"(.*)")?\s*\]')
+
+    def __init__(self, path: Path):
+        """
+        :param path: Working tree path.
+
+        :raises: OSError if repository dir is not found.
+
+        """
+        git_dir = path / '.git'
+
+        if git_dir.is_file():
+            # Worktrees and submodules.
+            git_dir = (path / git_dir.read_text().partition('gitdir:')[2].strip()).resolve()
+
+        if not (git_dir / 'HEAD').is_file():
+            raise FileNotFoundError(f'Git repository not found in {path}')
+
+        common_dir = git_dir
 
-        else:
-            self.run_command('push')
+        if (commondir_file := git_dir / 'commondir').is_file():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
 
-        self.run_command('push --tags')
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+
+    def get_head(self) -> str:
+        """Returns HEAD contents: either `ref: <ref name>` or commit hash."""
+        return (self.git_dir / 'HEAD').read_text().strip()
+
+    def get_branch(self) -> str | None:
+        """Returns current branch name or None for detached HEAD."""
+        head = self.get_head()
+
+        if head.startswith('ref: refs/heads/'):
+            return head.partition('refs/heads/')[2]
+
+        return None
+
+    def resolve_ref(self, ref: str = 'HEAD') -> str | None:
+        """Returns commit hash for the given ref (e.g. refs/heads/master)
+        or None if the ref does not exist (yet).
+
+        :param ref:
+
+        """
+        for _ in range(10):  # Guard against symbolic ref loops.
+
+            if ref == 'HEAD':
+                value = self.get_head()
+
+            else:
+                ref_file = self.common_dir / ref
+
+                if ref_file.is_file():
+                    value = ref_file.read_text().strip()
+
+                else:
+                    return self._get_packed_refs().get(ref)
+
+            if not value.startswith('ref: '):
+                return value
+
+            ref = value[5:].strip()
+
+        return None
+
+    def _get_packed_refs(self) -> dict[str, str]:
+        refs = {}
+        packed = self.common_dir / 'packed-refs'
+
+        if packed.is_file():
+            with packed.open() as f:
+                for line in f:
+                    if line.startswith(('#', '^')):
+                        continue
+                    sha, _, name = line.strip().partition(' ')
+                    if name:
+                        refs[name] = sha
+
+        return refs
+
+    def get_config(self) -> dict[tuple[str, str], dict[str, str]]:
+        """Returns repository config values indexed by (section, subsection) tuples."""
+
+        config = {}
+        values = None
+        re_section = self._re_section
+
+        with (self.common_dir / 'config').open() as f:
+
+            for line in f:
+                line = line.strip()
+
+                if not line or line.startswith(('#', ';')):
+                    continue
+
+                if match := re_section.match(line):
+                    section, subsection = match.groups()
+                    values = config.setdefault((section.lower(), subsection or ''), {})
+                    continue
+
+                if values is not None:
+                    key, _, value = line.partition('=')
+                    values[key.strip().lower()] = value.strip().strip('"')
+
+        return config
+
+    def get_remotes(self) -> list[str]:
+        """Returns remote names."""
+        return [subsection for section, subsection in self.get_config() if section == 'remote']
 
 
 class GitHelper(VcsHelper):
@@ -161,6 +352,49 @@ class GitHelper(VcsHelper):
     title = 'Git'
     alias = 'git'
 
+    @property
+    def repo(self) -> 'GitRepository | None':
+        """Repository files reader. None if repository files are not available."""
+
+        def get_repo():
+            try:
+                return GitRepository(self.path or Path.cwd())
+
+            except OSError:
+                return None
+
+        return self._cached('repo', get_repo)
+
+    def get_branch(self) -> str | None:
+        """Returns current branch name."""
+
+        def get_branch():
+            if repo := self.repo:
+                try:
+                    return repo.get_branch()
+
+                except OSError:
+                    pass
+
+            return super(GitHelper, self).get_branch()
+
+        return self._cached('branch', get_branch)
+
+    def get_remotes(self) -> list[str]:
+        """Returns a list of remotes."""
+
+        def get_remotes():
+            if repo := self.repo:
+                try:
+                    return repo.get_remotes()
+
+                except OSError:
+                    pass
+
+            return super(GitHelper, self).get_remotes()
+
+        return self._cached('remotes', get_remotes)
+
     def add_remote(self, address: str, *, alias: str = 'origin'):
         """Adds a remote repository.
 
@@ -0,0 +1,325 @@
+import json
+import logging
+import mmap
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from pathlib import Path
+from time import time
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .exceptions import AppMakerException
+from .utils import get_user_dir
+
+LOG = logging.getLogger(__name__)
+
+RE_NAME_SEPARATORS = re.compile(r'[-_.]+')
+RE_INDEX_LINK = re.compile(r'<a[^>]*>([^<]+)</a>')
+
+
+def normalize_name(name: str) -> str:
+    """Normalizes a project name as per PEP 503.
+
+    :param name:
+
+    """
+    return RE_NAME_SEPARATORS.sub('-', name).lower()
+
+
+class NameStatus:
+    """Name availability status for a registry."""
+
+    __slots__ = ['cached', 'in_use', 'name', 'registry', 'url']
+
+    def __init__(self, name: str, *, registry: str, url: str, in_use: bool | None, cached: bool = False):
+        """
+        :param name: Name checked.
+        :param registry: Registry label.
+        :param url: URL checked.
+        :param in_use: Whether the name is in use. None if unknown (e.g. network error).
+        :param cached: Whether the status is taken from cache.
+
+        """
+        self.name = name
+        self.registry = registry
+        self.url = url
+        self.in_use = in_use
+        self.cached = cached
+
+    def __str__(self):
+        status = {True: 'in use', False: 'available', None: 'unknown'}[self.in_use]
+        return f'{self.name}: {status} ({self.registry} - {self.url})'
+
+
+class NameChecker:
+    """Checks whether names are in use at package registries.
+
+    All the registries (and names) are queried concurrently using
+    pooled connections and HEAD requests. Results are cached on disk for `ttl` seconds.
+
+    """
+    registries: Mapping[str, str] = {
+        'PyPI': 'https://pypi.org/simple/{name}/',
+    }
+    """Registry label -> URL template. URL responding with 200 means that the name is in use."""
+
+    cache_filename = 'names.json'
+
+    def __init__(
+            self,
+            registries: dict[str, str] | None = None,
+            *,
+            timeout: float = 5,
+            ttl: int = 24 * 60 * 60,
+            cache_dir: Path | None = None,
+            max_workers: int = 8
+    ):
+        """
+        :param registries: Registry label -> URL template with {name} marker.
+        :param timeout: Request timeout in seconds.
+        :param ttl: Cached result time to live in seconds. 0 to disable cache.
+        :param cache_dir: Directory to store cache into. Default: ~/.makeapp/cache/
+        :param max_workers: Max number of concurrent requests.
+
+        """
+        self.registries = registries or self.registries
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache_path = Path(cache_dir or get_user_dir() / '.makeapp' / 'cache') / self.cache_filename
+        self.max_workers = max_workers
+
+    def _cache_read(self) -> dict:
+        try:
+            return json.loads(self.cache_path.read_text())
+
+        except (OSError, ValueError):
+            return {}
+
+    def _cache_write(self, cache: dict):
+        path = self.cache_path
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path_tmp = path.with_suffix('.tmp')
+            path_tmp.write_text(json.dumps(cache))
+            path_tmp.replace(path)
+
+        except OSError as e:
+            LOG.debug(f'Unable to save names cache: {e}')
+
+    def _request(self, session: requests.Session, url: str) -> bool | None:
+        try:
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+
+        except requests.RequestException as e:
+            LOG.warning(f'Unable to check {url}: {e}')
+            return None
+
+        status = response.status_code
+
+        if status == 200:
+            return True
+
+        if status in {404, 410}:
+            return False
+
+        LOG.warning(f'Unexpected response status {status} for {url}')
+
+        return None
+
+    def check(self, names: list[str]) -> list[NameStatus]:
+        """Checks names at every registry.
+        Returns statuses in names then registries order.
+
+        :param names:
+
+        """
+        now = time()
+        ttl = self.ttl
+        cache = self._cache_read() if ttl else {}
+
+        statuses = []
+        pending = {}
+
+        for name in names:
+            for registry, url in self.registries.items():
+                url = url.format(name=normalize_name(name))
+                status = NameStatus(name, registry=registry, url=url, in_use=None)
+                statuses.append(status)
+
+                cached = cache.get(url)
+
+                if cached and now - cached[0] < ttl:
+                    status.in_use = cached[1]
+                    status.cached = True
+
+                else:
+                    pending.setdefault(url, []).append(status)
+
+        if pending:
+            workers = min(self.max_workers, len(pending))
+
+            with requests.Session() as session:
+                adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = pool.map(lambda url: self._request(session, url), pending)
+
+                    for url, in_use in zip(pending, results, strict=True):
+                        for status in pending[url]:
+                            status.in_use = in_use
+
+                        if in_use is not None:
+                            cache[url] = [now, in_use]
+
+            if ttl:
+                # Drop expired entries not to grow indefinitely.
+                self._cache_write({url: entry for url, entry in cache.items() if now - entry[0] < ttl})
+
+        return statuses
+
+
+class IndexSnapshot:
+    """Local snapshot of a package index (simple API) projects list.
+
+    Names are normalized as per PEP 503 and stored sorted, one per line.
+    The file is memory-mapped and looked up with a binary search,
+    so a lookup costs a few page reads even for millions of names.
+
+    """
+    url_default = 'https://pypi.org/simple/'
+
+    def __init__(self, url: str = '', *, cache_dir: Path | None = None, timeout: float = 60):
+        """
+        :param url: Index URL. Local mirrors are supported: file:// URLs and paths to simple index HTML files.
+        :param cache_dir: Directory to store snapshots into. Default: ~/.makeapp/cache/
+        :param timeout: Request timeout in seconds.
+
+        """
+        self.url = url = url or self.url_default
+        self.timeout = timeout
+
+        cache_dir = Path(cache_dir or get_user_dir() / '.makeapp' / 'cache')
+        self.path = cache_dir / f'index_{sha1(url.encode()).hexdigest()[:12]}.names'
+        self._data: mmap.mmap | bytes | None = None
+
+    def __contains__(self, name: str) -> bool:
+        key = normalize_name(name).encode()
+        data = self.data
+
+        lo, hi = 0, len(data)
+
+        # Both bounds always point to lines starts.
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = data.rfind(b'\n', 0, mid) + 1
+            end = data.find(b'\n', start)
+            line = data[start:end]
+
+            if line == key:
+                return True
+
+            if line < key:
+                lo = end + 1
+
+            else:
+                hi = start
+
+        return False
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    @property
+    def meta(self) -> dict:
+        """Snapshot metadata: url, updated (timestamp), count."""
+        try:
+            return json.loads(self.path.with_suffix('.json').read_text())
+
+        except (OSError, ValueError):
+            return {}
+
+    @property
+    def data(self) -> mmap.mmap | bytes:
+        """Snapshot contents: sorted names separated by newlines."""
+        data = self._data
+
+        if data is None:
+
+            if not self.exists:
+                raise AppMakerException(f'No index snapshot for {self.url}. Update it first.')
+
+            with self.path.open('rb') as f:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+                except ValueError:
+                    # Empty file can't be mapped.
+                    data = b''
+
+            self._data = data
+
+        return data
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+    def _iter_lines(self) -> Iterator[str]:
+        url = self.url
+        parsed = urlparse(url)
+
+        if parsed.scheme in {'http', 'https'}:
+            with requests.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                response.encoding = response.encoding or 'utf-8'
+                yield from response.iter_lines(decode_unicode=True)
+
+            return
+
+        path = Path(url2pathname(parsed.path) if parsed.scheme == 'file' else url)
+
+        if path.is_dir():
+            path = path / 'index.html'
+
+        with path.open() as f:
+            yield from f
+
+    @classmethod
+    def _parse(cls, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            for name in RE_INDEX_LINK.findall(line or ''):
+                yield normalize_name(name.strip())
+
+    def update(self) -> int:
+        """Downloads index projects list and stores it as a snapshot.
+        Returns the number of names stored.
+
+        """
+        LOG.info(f'Updating index snapshot from {self.url} ...')
+
+        names = sorted({name.encode() for name in self._parse(self._iter_lines()) if name})
+
+        self.close()
+
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        path_tmp = path.with_suffix('.tmp')
+        path_tmp.write_bytes(b''.join(name + b'\n' for name in names))
+        path_tmp.replace(path)
+
+        path.with_suffix('.json').write_text(json.dumps({'url': self.url, 'updated': time(), 'count': len(names)}))
+
+        LOG.info(f'Index snapshot updated: {len(names)} names')
+
+        return len(names)
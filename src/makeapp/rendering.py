@@ -1,14 +1,26 @@
+import json
+import logging
 import os
-from contextlib import chdir
-from typing import TYPE_CHECKING
+import tempfile
+from contextlib import chdir, suppress
+from fnmatch import fnmatchcase
+from hashlib import sha256
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, ClassVar
 
-from jinja2 import Environment, FileSystemLoader
+import jinja2
+from jinja2 import Environment, FileSystemLoader, meta, nodes
 
-from .apptemplate import TemplateFile
+from .apptemplate import TemplateFile, TemplatePack
+from .events import EVENTS, FileRendered
+from .utils import get_user_dir
 
 if TYPE_CHECKING:
     from .appmaker import AppMaker
 
+LOG = logging.getLogger(__name__)
+
 
 class ContextMutator:
     """Mutator applying additional transformations to template get_context."""
@@ -40,18 +52,140 @@ class ContextMutator:
 class Renderer:
     """Performs file rendering."""
 
-    def __init__(self, maker, paths):
+    env_options: ClassVar[dict[str, bool]] = {
+        'keep_trailing_newline': True,
+        'trim_blocks': True,
+    }
+    """Jinja environment options. Template packs are compiled using the same options."""
+
+    env_cache_size = 1000
+    """Max number of compiled templates to keep."""
+
+    uncached_variables = ('*_secret_key',)
+    """Context variables name patterns. Rendering results referencing such variables
+    (secrets, values generated on every run) are not cached."""
+
+    def __init__(self, maker, paths, *, cache: 'RenderCache | None' = None):
+        """
+        :param maker:
+        :param paths: Templates search paths.
+        :param cache: Render cache. If not set rendering results are not cached.
+
+        """
         self.context_mutator = ContextMutator(maker=maker)
+        self.cache = cache
+
+        self._sources: dict[str, tuple[str, list[str] | None]] = {}
+        """Template name -> (source hash, referenced variables)."""
 
         paths = list({}.fromkeys(paths).keys())  # Unique.
         paths.insert(0, '.')  # Use current working dir.
 
-        self.env = Environment(
-            loader=DynamicParentLoader(paths),
-            keep_trailing_newline=True,
-            trim_blocks=True,
+        packs = {
+            app_template.name: app_template.pack
+            for app_template in maker.app_templates
+            if app_template.pack
+        }
+
+        self.env = DynamicParentEnvironment(
+            loader=DynamicParentLoader(paths, packs=packs),
+            # Templates are not expected to change during rollout.
+            auto_reload=False,
+            cache_size=self.env_cache_size,
+            **self.env_options,
+        )
+
+    @classmethod
+    def _get_variables(cls, ast: nodes.Template) -> list[str] | None:
+        """Returns variables referenced by a template.
+        None if rendering results of the template can't be cached,
+        since it references other templates (e.g. with include).
+
+        :param ast:
+
+        """
+        for node in ast.find_all((nodes.Include, nodes.Import, nodes.FromImport, nodes.Extends)):
+
+            # Parents chain hashes are a part of cache key.
+            if (
+                isinstance(node, nodes.Extends)
+                and isinstance(node.template, nodes.Name)
+                and node.template.name == 'parent_template'
+            ):
+                continue
+
+            return None
+
+        return sorted(meta.find_undeclared_variables(ast))
+
+    def _get_source_info(self, name: str, path: str = '') -> tuple[str, list[str] | None]:
+        """Returns template source hash and variables it references.
+
+        :param name: Template name.
+        :param path: Template file path for templates not loaded by name.
+
+        """
+        info = self._sources.get(name)
+
+        if info is None:
+
+            if path:
+                source = Path(path).read_text(encoding='utf-8')
+
+            else:
+                source = self.env.loader.get_source(self.env, name)[0]
+
+            source_hash = sha256(source.encode()).hexdigest()
+            cache = self.cache
+            known, variables = cache.get_variables(source_hash)
+
+            if not known:
+                variables = self._get_variables(self.env.parse(source))
+                cache.set_variables(source_hash, variables)
+
+            self._sources[name] = info = (source_hash, variables)
+
+        return info
+
+    def _get_cache_key(self, names: list[tuple[str, str]], context: dict) -> str | None:
+        """Returns render cache key for the given templates chain and context.
+        None if the result can't be cached.
+
+        :param names: (template name, template path) pairs. The first one is the template to be rendered,
+            the others are its parents.
+
+        :param context:
+
+        """
+        hashes = []
+        variables = set()
+
+        for name, path in names:
+            source_hash, source_variables = self._get_source_info(name, path)
+
+            if source_variables is None:
+                return None
+
+            hashes.append(source_hash)
+            variables.update(source_variables)
+
+        # Parents chain is represented by source hashes.
+        variables.discard('parent_template')
+
+        for pattern in self.uncached_variables:
+            if any(fnmatchcase(name, pattern) for name in variables):
+                return None
+
+        # Tell missing variables from those set to None.
+        values = [(name, name in context, context.get(name)) for name in sorted(variables)]
+
+        key = json.dumps(
+            [jinja2.__version__, sorted(self.env_options.items()), hashes, values],
+            default=repr,
         )
 
+        return sha256(key.encode()).hexdigest()
+
     def render(self, filename: str | TemplateFile) -> str:
         """Renders file contents with settings as get_context.
 
@@ -59,11 +193,14 @@ class Renderer:
 
         """
         context = self.context_mutator.get_context()
+        cache = self.cache
 
         if isinstance(filename, TemplateFile):
             # Let's compute template inheritance hierarchy for `parent_template`
             # context dynamic variable.
             parent_paths = filename.parent_paths
+            template_name = f'{filename.template.name}/{filename.path_rel}'
+            names = [(template_name, ''), *((parent_path, '') for parent_path in parent_paths)]
 
             if parent_paths:
                 parent_template = DynamicParentTemplate(parent_paths)
@@ -73,21 +210,227 @@ class Renderer:
 
             context['parent_template'] = parent_template
 
-            # Use exact location.
-            template = self.env.get_template(f'{filename.template.name}/{filename.path_rel}')
-
         else:
             filename_ = f'{filename}'
+            template_name = ''
+            names = [(f'file:{Path(filename_).resolve()}', filename_)]
+
+        instrumented = bool(EVENTS)
+
+        if instrumented:
+            started = perf_counter()
+
+        key = cache and self._get_cache_key(names, context)
+        rendered = cache.get(key) if key else None
+        cached = rendered is not None
+
+        if not cached:
+
+            if template_name:
+                # Use exact location.
+                template = self.env.get_template(template_name)
+
+            else:
+                # Try to pick file by basename.
+                with chdir(os.path.dirname(filename_)):
+                    template = self.env.get_template(os.path.basename(filename_))
+
+            rendered = template.render(**context)
 
-            # Try to pick file by basename.
-            with chdir(os.path.dirname(filename_)):
-                template = self.env.get_template(os.path.basename(filename_))
+            if key:
+                cache.set(key, rendered)
 
-        rendered = template.render(**context)
+        if instrumented:
+            EVENTS.emit(FileRendered(
+                template_name or filename_,
+                size=len(rendered.encode()),
+                duration=perf_counter() - started,
+                cached=cached,
+            ))
 
         return rendered
 
 
+class RenderCache:
+    """Persistent content-addressed cache of rendering results.
+
+    Results are keyed by hashes of template source, its parent templates sources
+    and values of context variables those templates reference, so a hit
+    is always up to date and skips Jinja entirely.
+
+    Least recently used entries are evicted when the cache exceeds `max_size`.
+    Entry files modification time is used to track usage.
+
+    """
+    dirname = 'render'
+
+    max_size_default = 32 * 1024 * 1024
+
+    suffix_result = '.txt'
+    suffix_variables = '.json'
+
+    def __init__(self, cache_dir: Path | None = None, *, max_size: int | None = None):
+        """
+        :param cache_dir: Directory to store cache into. Default: ~/.makeapp/cache/
+        :param max_size: Max cache size in bytes. Default: 32 MB.
+
+        """
+        self.path = Path(cache_dir or get_user_dir() / '.makeapp' / 'cache') / self.dirname
+        self.max_size = self.max_size_default if max_size is None else max_size
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None
+
+    def _read(self, filename: str) -> str | None:
+        path = self.path / filename
+
+        try:
+            data = path.read_text(encoding='utf-8')
+
+        except (OSError, ValueError):
+            return None
+
+        with suppress(OSError):
+            # Mark as recently used.
+            os.utime(path)
+
+        return data
+
+    def _write(self, filename: str, data: str):
+        path = self.path
+
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+
+            fd, path_tmp = tempfile.mkstemp(prefix='.', dir=path)
+
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+
+            Path(path_tmp).replace(path / filename)
+
+        except OSError as e:
+            LOG.debug(f'Unable to save render cache entry: {e}')
+            return
+
+        if self._size is None:
+            self._size = self.size
+
+        else:
+            self._size += len(data.encode())
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def _get_entries(self) -> list[tuple[str, os.stat_result]]:
+        entries = []
+
+        with suppress(FileNotFoundError), os.scandir(self.path) as items:
+            for item in items:
+                if not item.name.startswith('.'):
+                    with suppress(FileNotFoundError):
+                        entries.append((item.path, item.stat()))
+
+        return entries
+
+    def get(self, key: str) -> str | None:
+        """Returns cached rendering result.
+
+        :param key:
+
+        """
+        result = self._read(f'{key}{self.suffix_result}')
+
+        if result is None:
+            self.misses += 1
+
+        else:
+            self.hits += 1
+
+        return result
+
+    def set(self, key: str, result: str):
+        """Stores rendering result.
+
+        :param key:
+        :param result:
+
+        """
+        self._write(f'{key}{self.suffix_result}', result)
+
+    def get_variables(self, source_hash: str) -> tuple[bool, list[str] | None]:
+        """Returns a tuple: whether variables referenced by a template source
+        are known, and the variables (see `set_variables()`).
+
+        :param source_hash:
+
+        """
+        data = self._read(f'{source_hash}{self.suffix_variables}')
+
+        if data is None:
+            return False, None
+
+        try:
+            variables = json.loads(data)
+
+        except ValueError:
+            # Corrupted entry.
+            return False, None
+
+        if variables is not None and not isinstance(variables, list):
+            return False, None
+
+        return True, variables
+
+    def set_variables(self, source_hash: str, variables: list[str] | None):
+        """Stores variables referenced by a template source.
+
+        :param source_hash:
+        :param variables: None if rendering results for the template can't be cached.
+
+        """
+        self._write(f'{source_hash}{self.suffix_variables}', json.dumps(variables))
+
+    @property
+    def size(self) -> int:
+        """Cache size in bytes."""
+        return sum(stat.st_size for _, stat in self._get_entries())
+
+    @property
+    def count(self) -> int:
+        """Number of cached rendering results."""
+        return sum(1 for path, _ in self._get_entries() if path.endswith(self.suffix_result))
+
+    def evict(self, max_size: int | None = None):
+        """Removes least recently used entries until cache size is
+        below 80% of `max_size` (not to evict on every write).
+
+        :param max_size: Default: cache max size.
+
+        """
+        limit = (self.max_size if max_size is None else max_size) * 0.8
+
+        entries = sorted(self._get_entries(), key=lambda entry: entry[1].st_mtime_ns)
+        size = sum(stat.st_size for _, stat in entries)
+
+        for path, stat in entries:
+
+            if size <= limit:
+                break
+
+            Path(path).unlink(missing_ok=True)
+
+            size -= stat.st_size
+
+        self._size = size
+
+    def clear(self) -> int:
+        """Removes all the entries. Returns the number of bytes freed."""
+        size = self.size
+        self.evict(0)
+        return size
+
+
 class DynamicParentTemplate:
     """Represents jinja dynamic `parent_template` variable."""
 
@@ -112,20 +455,50 @@ class DynamicParentTemplate:
         return 'Namespace'  # hack
 
 
+class DynamicParentEnvironment(Environment):
+    """Resolves dynamic `parent_template` context variable into a concrete template name.
+
+    Parents are popped from per-file `DynamicParentTemplate` on every `{% extends %}`,
+    while compiled templates are cached by their concrete names, so that a parent
+    is compiled once however many files extend it.
+
+    """
+    def join_path(self, template, parent):
+        if isinstance(template, DynamicParentTemplate):
+            return f'{template.current}'
+
+        return super().join_path(template, parent)
+
+
 class DynamicParentLoader(FileSystemLoader):
-    """Allows dynamic swapping of `parent_template` template context variable."""
+    """Loads templates from search paths and template packs.
 
-    def get_source(self, environment, template):
+    Templates from template packs are loaded using precompiled code.
+
+    """
+    def __init__(self, searchpath, *, packs: dict[str, TemplatePack] | None = None, **kwargs):
+        """
+        :param searchpath:
+        :param packs: Template packs indexed by template names.
+        :param kwargs:
 
-        is_dynamic = isinstance(template, DynamicParentTemplate)
+        """
+        super().__init__(searchpath, **kwargs)
+        self.packs = packs or {}
+
+    def load(self, environment, name, globals=None):
+        template_name, _, path_rel = name.partition('/')
 
-        if is_dynamic:
-            template = f'{template.current}'
+        if pack := self.packs.get(template_name):
+            code = pack.get_template_code(environment, path_rel)
+            return environment.template_class.from_code(environment, code, globals or {}, lambda: True)
 
-        source, filename, uptodate = super().get_source(environment, template)
+        return super().load(environment, name, globals)
+
+    def get_source(self, environment, template):
+        template_name, _, path_rel = template.partition('/')
 
-        if is_dynamic:
-            # Prevent `parent_template` context variable caching.
-            uptodate = lambda: False
+        if pack := self.packs.get(template_name):
+            return pack.get_source(path_rel), None, lambda: True
 
-        return source, filename, uptodate
+        return super().get_source(environment, template)
@@ -0,0 +1,166 @@
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from .exceptions import AppMakerException
+
+RE_MARKER = re.compile(r'{{ ([^}]+) }}')
+
+
+class Settings(dict):
+    """Settings dictionary resolving `{{ name }}` markers in its values.
+
+    Raw (unresolved) values are kept aside together with a dependency graph
+    (setting -> settings it references), so that an update re-evaluates only
+    the changed settings and those depending on them, in topological order.
+
+    """
+
+    def __init__(self, values: dict | None = None):
+        """
+        :param values: Initial settings.
+
+        """
+        super().__init__()
+
+        self.raw: dict[str, Any] = {}
+        """Unresolved settings values."""
+
+        self.deps: dict[str, set[str]] = {}
+        """Names of settings referenced by a setting."""
+
+        self.update(values or {})
+
+    def __setitem__(self, name: str, value: Any):
+        self.update({name: value})
+
+    def update(self, values: dict | None = None, /, **kwargs) -> set[str]:
+        """Updates settings resolving markers.
+
+        Returns a set of settings names which were (re)evaluated.
+
+        A setting referencing itself (e.g. `{{ description }} extended`)
+        is resolved against its previous value.
+
+        :param values:
+        :param kwargs:
+
+        :raises: AppMakerException on circular references. Settings are left intact.
+
+        """
+        values = {**(values or {}), **kwargs}
+        raw_new = {}
+        deps_new = {}
+
+        for name, value in values.items():
+            refs = set()
+
+            if isinstance(value, str):
+                refs = set(RE_MARKER.findall(value))
+
+                if name in refs:
+                    refs.discard(name)
+
+                    if (value_prev := self.get(name)) is not None:
+                        value = value.replace(f'{{{{ {name} }}}}', f'{value_prev}')
+
+            raw_new[name] = value
+            deps_new[name] = refs
+
+        deps = {**self.deps, **deps_new}
+        dirty = self._get_dependents(values, deps=deps)
+        ordered = self._sort(dirty, deps=deps)
+
+        raw = self.raw
+        raw.update(raw_new)
+        self.deps = deps
+
+        for name in ordered:
+            value = raw[name]
+            super().__setitem__(name, None if value is None else self.substitute(value))
+
+        return dirty
+
+    def substitute(self, target: Any, *, strip_unknown: bool = False) -> str:
+        """Replaces settings markers in `target` with current settings values in one pass.
+
+        :param target:
+        :param strip_unknown: Strip unknown markers from the target.
+
+        """
+        def replace(match: re.Match) -> str:
+            value = self.get(match.group(1))
+
+            if value is None:
+                return '' if strip_unknown else match.group(0)
+
+            return f'{value}'
+
+        return RE_MARKER.sub(replace, f'{target}')
+
+    @classmethod
+    def _get_dependents(cls, names: Iterable[str], *, deps: dict[str, set[str]]) -> set[str]:
+        """Returns the given names along with the names of all settings depending on them.
+
+        :param names:
+        :param deps: Dependency graph.
+
+        """
+        dependents = defaultdict(set)
+
+        for name, refs in deps.items():
+            for ref in refs:
+                dependents[ref].add(name)
+
+        result = set()
+        stack = list(names)
+
+        while stack:
+            name = stack.pop()
+
+            if name in result:
+                continue
+
+            result.add(name)
+            stack.extend(dependents[name])
+
+        return result
+
+    @classmethod
+    def _sort(cls, names: set[str], *, deps: dict[str, set[str]]) -> list[str]:
+        """Returns the given settings names in topological order:
+        referenced settings go before those referencing them.
+
+        :param names:
+        :param deps: Dependency graph.
+
+        :raises: AppMakerException on circular references.
+
+        """
+        ordered = []
+        done = set()
+        in_progress = []
+
+        def visit(name: str):
+            if name in done:
+                return
+
+            if name in in_progress:
+                cycle = [*in_progress[in_progress.index(name):], name]
+                raise AppMakerException(f"Circular settings reference: {' -> '.join(cycle)}.")
+
+            in_progress.append(name)
+
+            for ref in sorted(deps.get(name, ())):
+                if ref in names:
+                    visit(ref)
+
+            in_progress.pop()
+            done.add(name)
+            ordered.append(name)
+
+        for name in sorted(names):
+            visit(name)
+
+        return ordered
@@ -0,0 +1,178 @@
+import logging
+import re
+import shutil
+import tarfile
+import tempfile
+from hashlib import sha1
+from pathlib import Path
+from shlex import quote
+from urllib.parse import urlsplit, urlunsplit
+
+from .exceptions import AppMakerException, CommandError
+from .utils import get_user_dir, run_command
+
+LOG = logging.getLogger(__name__)
+
+
+class GitTemplateSource:
+    """Application template from a git repository.
+
+    Spec format: git+<url>[@<rev>][#<subdirectory>]
+        git+https://example.com/templates.git@v1.0#cool
+        git+file:///home/librarian/templates.git@2b5a4c...
+
+    Repositories are shallow-fetched into a cache, and their trees are stored
+    in directories named after commits (content-addressed), so that a revision
+    once fetched is reused with no network access.
+
+    Explicitly given revisions are considered immutable and are fetched only once.
+    Without a revision remote HEAD is fetched on every run, falling back
+    to the cached one if the remote is not available.
+
+    """
+    prefix = 'git+'
+    rev_default = 'HEAD'
+
+    re_commit = re.compile(r'^[0-9a-f]{40}$')
+
+    def __init__(self, spec: str, *, cache_dir: Path | None = None):
+        """
+        :param spec: Template spec. See class docstring.
+        :param cache_dir: Cache directory. Default: ~/.makeapp/templates/
+
+        """
+        url, _, subdir = spec.removeprefix(self.prefix).partition('#')
+        scheme, netloc, path, query, _ = urlsplit(url)
+
+        rev = ''
+        at = path.rfind('@')
+
+        # Revisions may contain slashes (feature/x). User part is in netloc for URLs
+        # with a scheme, but for scp-like addresses (git@host:repo.git) it is in path,
+        # so there only `@` after the host is considered.
+        if at > (-1 if scheme else path.find(':')):
+            path, rev = path[:at], path[at + 1:]
+
+        self.url = urlunsplit((scheme, netloc, path, query, ''))
+        self.rev = rev
+        self.subdir = subdir.strip('/')
+        self.name = re.split('[/:]', path.rstrip('/'))[-1].removesuffix('.git')
+
+        self.cache_dir = Path(cache_dir or get_user_dir() / '.makeapp' / 'templates')
+        self.repo_dir = self.cache_dir / 'repos' / sha1(self.url.encode()).hexdigest()[:16]
+
+    def __str__(self):
+        return f"{self.url}@{self.rev or self.rev_default}{f'#{self.subdir}' if self.subdir else ''}"
+
+    @classmethod
+    def is_spec(cls, spec: str) -> bool:
+        """Whether the given template spec points to a git repository.
+
+        :param spec:
+
+        """
+        return spec.startswith(cls.prefix)
+
+    def _git(self, command: str) -> list[str]:
+        return run_command(f'git --git-dir={quote(f"{self.repo_dir}")} {command}')
+
+    @property
+    def _ref(self) -> str:
+        # Local reference to keep fetched revision.
+        return f'refs/sources/{self.rev or self.rev_default}'
+
+    def _resolve(self) -> str | None:
+        """Returns commit hash for the revision if it's already fetched."""
+
+        if not self.repo_dir.exists():
+            return None
+
+        rev = self.rev
+
+        ref = rev if self.re_commit.match(rev) else self._ref
+
+        try:
+            lines = self._git(f'rev-parse --verify -q {quote(f"{ref}^{{commit}}")}')
+
+        except CommandError:
+            return None
+
+        return lines[0] if lines else None
+
+    def _fetch(self) -> str:
+        """Fetches the revision and returns its commit hash."""
+
+        LOG.info(f'Fetching template from {self} ...')
+
+        repo_dir = self.repo_dir
+
+        if not repo_dir.exists():
+            repo_dir.parent.mkdir(parents=True, exist_ok=True)
+            run_command(f'git init -q --bare {quote(f"{repo_dir}")}')
+
+        self._git(f'fetch -q --depth 1 {quote(self.url)} {quote(self.rev or self.rev_default)}')
+        commit = self._git('rev-parse FETCH_HEAD')[0]
+        self._git(f'update-ref {quote(self._ref)} {commit}')
+
+        return commit
+
+    def get_commit(self) -> str:
+        """Returns commit hash for the revision, fetching it if required."""
+
+        commit = self._resolve()
+
+        if self.rev:
+
+            if commit is None:
+                commit = self._fetch()
+
+            return commit
+
+        try:
+            return self._fetch()
+
+        except CommandError:
+            if commit is None:
+                raise
+
+            LOG.warning(f'Unable to fetch {self}. Cached {commit} is used.')
+
+        return commit
+
+    def get_path(self) -> Path:
+        """Returns a path to template directory, fetching and extracting it if required."""
+
+        commit = self.get_commit()
+        name = self.name
+
+        tree_dir = self.cache_dir / commit
+        repo_path = tree_dir / name
+
+        if not repo_path.exists():
+            tree_dir.mkdir(parents=True, exist_ok=True)
+            dir_tmp = tempfile.mkdtemp(prefix=f'.{name}.', dir=tree_dir)
+
+            try:
+                archive = f'{dir_tmp}.tar'
+                self._git(f'archive --format=tar -o {quote(archive)} {commit}')
+
+                with tarfile.open(archive) as tar:
+                    tar.extractall(dir_tmp, filter='data')
+
+                Path(dir_tmp).replace(repo_path)
+
+            except OSError:
+                # Extracted concurrently.
+                if not repo_path.exists():
+                    raise
+
+            finally:
+                shutil.rmtree(dir_tmp, ignore_errors=True)
+                Path(f'{dir_tmp}.tar').unlink(missing_ok=True)
+
+        path = repo_path / self.subdir if self.subdir else repo_path
+
+        if not path.is_dir():
+            raise AppMakerException(f'Unable to find application template {self}. No {path} directory.')
+
+        return path
@@ -1,18 +1,23 @@
 import configparser
-import fileinput
 import logging
 import os
+import re
 import shutil
 import sys
 import tempfile
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from configparser import ConfigParser
 from contextlib import contextmanager
 from pathlib import Path
+from secrets import token_hex
 from subprocess import PIPE, STDOUT, Popen
 from textwrap import indent
+from time import perf_counter
+from typing import Self
 
-from .exceptions import CommandError
+from .events import EVENTS, SubprocessFinished, SubprocessStarted
+from .exceptions import CommandError, TaskError
 
 LOG = logging.getLogger(__name__)
 PYTHON_VERSION = sys.version_info
@@ -62,21 +67,261 @@ def temp_dir() -> Generator[str, None, None]:
         shutil.rmtree(dir_tmp, ignore_errors=True)
 
 
-def replace_infile(filepath: str, pairs: dict[str, str]):
+class Replacer:
+    """Replaces many terms in many files at once.
+
+    All the terms are compiled into a single alternation, so every line
+    is scanned once and a replacement is never rescanned for other terms.
+    Longer terms win over their prefixes.
+
+    Files are streamed into temporary files which then atomically replace
+    the originals (files without matches are left untouched).
+    No global state is involved, so it's safe to be used from threads.
+
+    """
+    encoding = 'utf-8'
+
+    def __init__(self, pairs: dict[str, str]):
+        """
+        :param pairs: search -> replace. Terms are matched within lines.
+
+        """
+        self.pairs = {search: replace for search, replace in pairs.items() if search}
+        self.pattern = re.compile('|'.join(
+            re.escape(search) for search in sorted(self.pairs, key=len, reverse=True)
+        )) if self.pairs else None
+
+    def replace(self, text: str) -> tuple[str, int]:
+        """Returns the text with the terms replaced and the number of replacements made.
+
+        :param text:
+
+        """
+        if self.pattern is None:
+            return text, 0
+
+        pairs = self.pairs
+
+        return self.pattern.subn(lambda match: pairs[match.group(0)], text)
+
+    def replace_file(self, filepath: str | Path) -> int:
+        """Replaces the terms in a file. Returns the number of replacements made.
+
+        :param filepath:
+
+        """
+        if self.pattern is None:
+            return 0
+
+        filepath = Path(filepath)
+        encoding = self.encoding
+        replace = self.replace
+        count = 0
+
+        fd, path_tmp = tempfile.mkstemp(prefix=f'.{filepath.name}.', dir=filepath.parent)
+        path_tmp = Path(path_tmp)
+
+        try:
+            with filepath.open(encoding=encoding, newline='') as f_src, \
+                    os.fdopen(fd, 'w', encoding=encoding, newline='') as f_tmp:
+
+                for line in f_src:
+                    line, replaced = replace(line)
+                    count += replaced
+                    f_tmp.write(line)
+
+            if count:
+                shutil.copymode(filepath, path_tmp)
+                path_tmp.replace(filepath)
+
+        finally:
+            path_tmp.unlink(missing_ok=True)
+
+        return count
+
+    def replace_files(self, filepaths: Iterable[str | Path], *, max_workers: int | None = None) -> dict[Path, int]:
+        """Replaces the terms in files concurrently.
+        Returns replacements counts for files.
+
+        :param filepaths:
+        :param max_workers: Max number of threads. Default: ThreadPoolExecutor default.
+
+        """
+        filepaths = list(dict.fromkeys(Path(filepath) for filepath in filepaths))
+
+        if len(filepaths) < 2:
+            return {filepath: self.replace_file(filepath) for filepath in filepaths}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(filepaths, pool.map(self.replace_file, filepaths), strict=True))
+
+
+def replace_infiles(
+        filepaths: Iterable[str | Path],
+        pairs: dict[str, str],
+        *,
+        max_workers: int | None = None
+) -> dict[Path, int]:
+    """Replaces terms in files contents in one pass per file.
+    Returns replacements counts for files. See Replacer.
+
+    :param filepaths:
+    :param pairs: search -> replace.
+    :param max_workers: Max number of threads.
+
+    """
+    return Replacer(pairs).replace_files(filepaths, max_workers=max_workers)
+
+
+def replace_infile(filepath: str | Path, pairs: dict[str, str]) -> int:
     """Replaces some term by another in file contents.
+    Returns the number of replacements made. See Replacer.
+
+    Note: all the pairs are applied in a single pass, so unlike
+    sequential replacements a replacement result is never
+    matched by subsequent pairs.
 
     :param filepath:
     :param pairs: search -> replace.
 
     """
-    with fileinput.input(files=filepath, inplace=True) as f:
+    return Replacer(pairs).replace_file(filepath)
+
+
+class StagingDir:
+    """Stages files in a sibling directory of the target one
+    and then moves them into place all at once.
+
+    * Directories are created once for the whole files set.
+    * Files are synced to disk in one batch before being moved.
+    * If the target directory doesn't exist (or is empty), the staging
+      directory itself is renamed into place, otherwise
+      files are moved one by one, each atomically.
+
+    Nothing is written into the target on errors.
+
+    """
+    def __init__(self, target: str | Path):
+        """
+        :param target: Target directory.
+
+        """
+        self.target = target = Path(target).absolute()
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Not mkdtemp() to have default permissions for the case of the directory swap.
+        self.path = path = target.parent / f'.{target.name}.stage_{os.getpid()}_{token_hex(4)}'
+        path.mkdir()
+        self.files: list[str] = []
+        self.dirs: set[str] = set()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+
+        else:
+            self.discard()
+
+    @classmethod
+    def _get_leaf_dirs(cls, dirs: Iterable[str]) -> list[str]:
+        # Only directories not being parents of others are required for makedirs.
+        dirs = set(dirs) - {''}
+        parents = {f'{parent}' for dirname in dirs for parent in Path(dirname).parents}
+        return sorted(dirs - parents)
+
+    @staticmethod
+    def _get_dirname(path_rel: str) -> str:
+        dirname = f'{Path(path_rel).parent}'
+        return '' if dirname == '.' else dirname
+
+    @classmethod
+    def _makedirs(cls, base: Path, dirs: Iterable[str]):
+        for dirname in cls._get_leaf_dirs(dirs):
+            (base / dirname).mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def _fsync(cls, path: Path, *, flags: int = os.O_RDONLY):
+        fd = os.open(path, flags)
+
+        try:
+            os.fsync(fd)
+
+        finally:
+            os.close(fd)
+
+    def prepare(self, paths_rel: Iterable[str]):
+        """Creates directories for all the given files at once.
+
+        :param paths_rel: Files paths relative to the target directory.
+
+        """
+        dirs = {self._get_dirname(path_rel) for path_rel in paths_rel} - self.dirs
+        self._makedirs(self.path, dirs)
+        self.dirs.update(dirs)
+
+    def write(self, path_rel: str, contents: str, *, mode: int | None = None):
+        """Writes a file into the staging directory.
+
+        :param path_rel: File path relative to the target directory.
+        :param contents:
+        :param mode: File permissions.
+
+        """
+        if self._get_dirname(path_rel) not in self.dirs:
+            self.prepare([path_rel])
+
+        with (self.path / path_rel).open('w') as f:
+            f.write(contents)
+
+            if mode is not None:
+                os.fchmod(f.fileno(), mode)
+
+        self.files.append(path_rel)
 
-        for line in f:
+    def commit(self):
+        """Syncs staged files and moves them into the target directory."""
 
-            for search, replace in pairs.items():
-                line = line.replace(search, replace)
+        path = self.path
+        target = self.target
+        files = self.files
 
-            sys.stdout.write(line)
+        for path_rel in files:
+            self._fsync(path / path_rel)
+
+        try:
+            swap = not any(target.iterdir()) and target != Path.cwd()
+
+        except FileNotFoundError:
+            swap = True
+
+        if swap:
+            if target.exists():
+                shutil.copymode(target, path)
+
+            path.replace(target)
+            dirs_synced = [target.parent]
+
+        else:
+            self._makedirs(target, self.dirs)
+
+            for path_rel in files:
+                (path / path_rel).replace(target / path_rel)
+
+            dirs_synced = {(target / path_rel).parent for path_rel in files}
+            shutil.rmtree(path, ignore_errors=True)
+
+        for dirname in dirs_synced:
+            self._fsync(dirname)
+
+        self.files = []
+
+    def discard(self):
+        """Removes the staging directory with all the staged files."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.files = []
 
 
 def check_command(command: str, *, hint: str):
@@ -96,7 +341,14 @@ def check_command(command: str, *, hint: str):
             f"Check {hint} is installed and available.") from e
 
 
-def run_command(command: str, *, err_msg: str = '', env: dict | None = None, capture: bool = True) -> list[str]:
+def run_command(
+        command: str,
+        *,
+        err_msg: str = '',
+        env: dict | None = None,
+        capture: bool = True,
+        input: str | None = None
+) -> list[str]:
     """Runs a command in a shell process.
 
     Returns a list of strings gathered from a command.
@@ -105,6 +357,7 @@ def run_command(command: str, *, err_msg: str = '', env: dict | None = None, cap
     :param err_msg: Message to show on error.
     :param env: Environment variables to use.
     :param capture: Capture stdout and stderr and return as lines.
+    :param input: Data to pass to process stdin.
 
     :raises: CommandError
 
@@ -118,8 +371,28 @@ def run_command(command: str, *, err_msg: str = '', env: dict | None = None, cap
     if capture:
         kwargs = {'stdout': PIPE, 'stderr': STDOUT}
 
-    prc = Popen(command, shell=True, universal_newlines=True, env=env, **kwargs)
-    out, _ = prc.communicate()
+    if input is not None:
+        kwargs['stdin'] = PIPE
+
+    instrumented = bool(EVENTS)
+    prc = None
+
+    if instrumented:
+        EVENTS.emit(SubprocessStarted(command))
+        started = perf_counter()
+
+    try:
+        prc = Popen(command, shell=True, universal_newlines=True, env=env, **kwargs)
+        out, _ = prc.communicate(input)
+
+    finally:
+        if instrumented:
+            # Always paired with the start event. Return code is None if not available.
+            EVENTS.emit(SubprocessFinished(
+                command,
+                returncode=None if prc is None else prc.returncode,
+                duration=perf_counter() - started,
+            ))
 
     if out:
         LOG.debug(indent(out, prefix="    "))
@@ -134,6 +407,158 @@ def run_command(command: str, *, err_msg: str = '', env: dict | None = None, cap
     return data
 
 
+class Task:
+    """Represents a task in a task graph."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_OK = 'ok'
+    STATUS_FAIL = 'failed'
+    STATUS_SKIP = 'skipped'
+
+    __slots__ = ['deps', 'duration', 'error', 'func', 'name', 'status']
+
+    def __init__(self, name: str, func: Callable, *, deps: Iterable[str] = ()):
+        """
+        :param name: Task name.
+        :param func: Callable to run.
+        :param deps: Names of tasks to be successfully run before this one.
+
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.status = self.STATUS_PENDING
+        self.error: BaseException | None = None
+        self.duration = 0.0
+
+    def __str__(self):
+        details = f' ({self.error})' if self.error else ''
+        return f'{self.name}: {self.status} [{self.duration:.2f}s]{details}'
+
+    def run(self):
+        started = perf_counter()
+
+        try:
+            self.func()
+
+        finally:
+            self.duration = perf_counter() - started
+
+
+class TaskGraph:
+    """Runs tasks concurrently in a thread pool respecting dependencies between them.
+
+    Tasks depending on failed ones are skipped.
+
+    """
+
+    def __init__(self, *, max_workers: int | None = None):
+        """
+        :param max_workers: Maximum number of tasks to run concurrently.
+
+        """
+        self.max_workers = max_workers
+        self.tasks: dict[str, Task] = {}
+
+    def add(self, name: str, func: Callable, *, deps: Iterable[str] = ()) -> Task:
+        """Adds a task.
+
+        :param name: Task name.
+        :param func: Callable to run.
+        :param deps: Names of tasks to be successfully run before this one.
+
+        """
+        task = Task(name, func, deps=deps)
+        self.tasks[name] = task
+        return task
+
+    def _sort(self) -> list[Task]:
+        tasks = self.tasks
+        ordered = []
+        visiting = set()
+        done = set()
+
+        def visit(task: Task):
+            name = task.name
+
+            if name in done:
+                return
+
+            if name in visiting:
+                raise TaskError(f'Circular task dependency: {name}')
+
+            visiting.add(name)
+
+            for dep in task.deps:
+                if dep not in tasks:
+                    raise TaskError(f'Unknown task `{dep}` required by `{name}`')
+                visit(tasks[dep])
+
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(task)
+
+        for task in tasks.values():
+            visit(task)
+
+        return ordered
+
+    def run(self) -> dict[str, Task]:
+        """Runs tasks. Returns tasks indexed by names.
+
+        :raises: TaskError if any task failed.
+
+        """
+        tasks = self.tasks
+        pending = self._sort()
+        running = {}
+
+        for task in pending:
+            task.status = Task.STATUS_PENDING
+            task.error = None
+
+        ok, fail, skip = Task.STATUS_OK, Task.STATUS_FAIL, Task.STATUS_SKIP
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='makeapp') as pool:
+
+            while pending or running:
+
+                for task in pending[:]:  # Topologically sorted.
+                    statuses = {tasks[dep].status for dep in task.deps}
+
+                    if statuses & {fail, skip}:
+                        task.status = skip
+                        pending.remove(task)
+
+                    elif statuses <= {ok}:
+                        LOG.debug(f'Task {task.name} started ...')
+                        running[pool.submit(task.run)] = task
+                        pending.remove(task)
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task = running.pop(future)
+
+                    if error := future.exception():
+                        task.status = fail
+                        task.error = error
+
+                    else:
+                        task.status = ok
+
+                    LOG.debug(f'Task {task}')
+
+        if any(task.status != ok for task in tasks.values()):
+            details = '\n  '.join(map(str, tasks.values()))
+            raise TaskError(f'Some tasks failed:\n  {details}')
+
+        return tasks
+
+
 class Ruff:
     """Ruff wrapper."""
 
@@ -1,10 +1,21 @@
 import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from threading import Thread
 
 import pytest
 
 os.environ['UV_NO_DEV'] = '1'  # disable dev packages in venv to speedup tests
 
+
+@pytest.fixture(autouse=True)
+def render_cache_home(tmp_path_factory, monkeypatch):
+    # Render cache is not to be shared between tests and with the user.
+    home = tmp_path_factory.mktemp('home')
+    monkeypatch.setattr('makeapp.rendering.get_user_dir', lambda: home)
+    return home
+
+
 @pytest.fixture
 def get_appmaker():
 
@@ -75,3 +86,58 @@ def in_tmp_path(tmp_path):
         yield tmp_path
     finally:
         os.chdir(before)
+
+
+@pytest.fixture
+def index_server():
+    """Local stand-in for a package index (simple API).
+    Projects listed in `projects` are reported as existing.
+
+    """
+    class Server(ThreadingHTTPServer):
+
+        @property
+        def url(self) -> str:
+            return f'http://127.0.0.1:{self.server_port}/simple/'
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def respond(self, body: bytes = b''):
+            path = self.path.strip('/').split('/')
+            server.requests.append((self.command, self.path))
+
+            if path == ['simple']:
+                body = ''.join(f'<a href="/simple/{name}/">{name}</a>\n' for name in sorted(server.projects))
+                status = 200
+                body = body.encode()
+
+            else:
+                status = 200 if path[-1] in server.projects else 404
+
+            self.send_response(status)
+            self.send_header('Content-Length', f'{len(body)}')
+            self.end_headers()
+
+            return body
+
+        def do_HEAD(self):
+            self.respond()
+
+        def do_GET(self):
+            self.wfile.write(self.respond())
+
+        def log_message(self, format, *args):
+            pass
+
+    server = Server(('127.0.0.1', 0), Handler)
+    server.projects = {'django'}
+    server.requests = []
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+
+    finally:
+        server.shutdown()
+        server.server_close()
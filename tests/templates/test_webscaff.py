@@ -0,0 +1,110 @@
+import os
+import sys
+
+from makeapp.appmaker import AppMaker
+
+
+def test_tpl_webscaff_provision(in_tmp_path, monkeypatch):
+
+    app_maker = AppMaker('dummy', templates_to_use=['webscaff'])
+    app_template = next(app_template for app_template in app_maker.app_templates if app_template.name == 'webscaff')
+
+    config = app_template.config
+    config.package_name = 'dummy'
+
+    executed = []
+    monkeypatch.setattr(sys.modules['makeapp.config.webscaff'], 'run_command', executed.append)
+
+    config.prepare_venv()
+    config.prepare_db()
+
+    venv, install, db = executed
+
+    assert venv == 'uv venv -q venv/'
+
+    # One resolution for everything.
+    assert install == (
+        'uv pip install -q --python venv/bin/python '
+        '-r requirements.txt -r tests/requirements.txt -e .')
+
+    # Migrations in one process.
+    assert db.startswith('venv/bin/python -c ')
+    assert "'dummy.settings.auto'" in db
+    assert db.index("'makemigrations'") < db.index("'migrate'")
+
+
+def test_tpl_webscaff(in_tmp_path, monkeypatch, assert_content):
+
+    executed = []
+
+    app_maker = AppMaker('dummy', templates_to_use=['webscaff'])
+    app_maker.update_settings_complex(dictionary={
+        'webscaff_domain': 'dummy.wrld',
+        'webscaff_email': 'librarian@discworld.wrld',
+        'webscaff_host': '127.0.0.1',
+    })
+    monkeypatch.setattr(sys.modules['makeapp.config.webscaff'], 'run_command', executed.append)
+
+    app_maker.rollout('.', overwrite=True)
+
+    # Django files are rendered, not generated by django-admin.
+    assert not [command for command in executed if 'django-admin' in command]
+
+    secret_key = app_maker.settings['webscaff_secret_key']
+    assert len(secret_key) > 50
+
+    dir_package = in_tmp_path / 'src' / 'dummy'
+
+    assert_content(dir_package / 'settings' / 'base.py', [
+        f"SECRET_KEY = '{secret_key}'",
+        "ROOT_URLCONF = 'dummy.urls'",
+        "WSGI_APPLICATION = 'dummy.wsgi.application'",
+        "    'dummy.core',",
+    ])
+    assert_content(dir_package / 'manage.py', ["'dummy.settings.auto'"])
+    assert_content(dir_package / 'wsgi.py', ["'dummy.settings.auto'"])
+    assert_content(dir_package / 'core' / 'apps.py', ["name = 'dummy.core'"])
+    assert (dir_package / 'core' / 'migrations' / '__init__.py').exists()
+
+
+def test_tpl_webscaff_manage(in_tmp_path, monkeypatch):
+
+    app_maker = AppMaker('dummy', templates_to_use=['webscaff'])
+    app_maker.update_settings_complex(dictionary={
+        'license': 'apache2',
+        'webscaff_domain': 'dummy.wrld',
+        'webscaff_email': 'librarian@discworld.wrld',
+        'webscaff_host': '127.0.0.1',
+    })
+    monkeypatch.setattr(sys.modules['makeapp.config.webscaff'], 'run_command', lambda command: [])
+
+    app_maker.rollout('.', overwrite=True)
+
+    manage = in_tmp_path / 'src' / 'dummy' / 'manage.py'
+    lines = manage.read_text().splitlines()
+
+    # License header goes after the shebang.
+    assert lines[0] == '#!/usr/bin/env python'
+    assert lines[1] == '#'
+    assert 'Licensed under the Apache License' in manage.read_text()
+    assert os.access(manage, os.X_OK)
+
+
+def test_tpl_webscaff_secret_uncached(in_tmp_path, monkeypatch, render_cache_home):
+
+    app_maker = AppMaker('dummy', templates_to_use=['webscaff'])
+    app_maker.update_settings_complex(dictionary={
+        'webscaff_domain': 'dummy.wrld',
+        'webscaff_email': 'librarian@discworld.wrld',
+        'webscaff_host': '127.0.0.1',
+    })
+    monkeypatch.setattr(sys.modules['makeapp.config.webscaff'], 'run_command', lambda command: [])
+
+    app_maker.rollout('.', overwrite=True)
+
+    secret_key = app_maker.settings['webscaff_secret_key']
+    cached = list((render_cache_home / '.makeapp' / 'cache' / 'render').glob('*.txt'))
+
+    # Other files are cached, but not the one with the secret.
+    assert cached
+    assert not [path for path in cached if secret_key in path.read_text()]
@@ -1,8 +1,28 @@
+import os
+import shutil
+import sys
+from contextlib import chdir
+from pathlib import Path
+from threading import Barrier
+from types import ModuleType
 
-def test_default(in_tmp_path, get_appmaker, assert_content):
+import pytest
+from jinja2 import Environment, Template
 
-    assert not get_appmaker('django', rollout=False).check_app_name_is_available()
-    assert get_appmaker('x7t8whatsthat', rollout=False).check_app_name_is_available()
+from makeapp.apptemplate import AppTemplate, TemplateFile, TemplatePack
+from makeapp.exceptions import AppMakerException, CommandError, TaskError
+from makeapp.names import NameChecker
+from makeapp.rendering import RenderCache, Renderer
+from makeapp.settings import Settings
+from makeapp.sources import GitTemplateSource
+from makeapp.utils import run_command
+
+
+def test_default(in_tmp_path, get_appmaker, assert_content, index_server):
+
+    checker = NameChecker({'Local': f'{index_server.url}{{name}}/'}, cache_dir=in_tmp_path / 'cache')
+    assert not get_appmaker('django', rollout=False).check_app_name_is_available(checker=checker)
+    assert get_appmaker('x7t8whatsthat', rollout=False).check_app_name_is_available(checker=checker)
 
     app_maker = get_appmaker(init_venv=True)
 
@@ -55,3 +75,478 @@ def test_tpl_userdefined(in_tmp_path, tmp_path, get_appmaker, assert_content):
     assert_content(in_tmp_path / 'pyproject.toml', [
         '# some custom',
     ])
+
+
+def test_settings_resolution():
+
+    settings = Settings({
+        'url': 'https://some.wrld/{{ author }}/{{ app_name }}',
+        'author': '{{ app_name }} contributors',
+        'app_name': 'dummy',
+        'email': '{{ unknown }}',
+    })
+    assert settings['url'] == 'https://some.wrld/dummy contributors/dummy'
+    assert settings['email'] == '{{ unknown }}'
+    assert settings.substitute('{{ unknown }}x', strip_unknown=True) == 'x'
+
+    assert settings.update({'app_name': 'other'}) == {'app_name', 'author', 'url'}
+    assert settings['url'] == 'https://some.wrld/other contributors/other'
+
+    settings['author'] = 'me'
+    assert settings['url'] == 'https://some.wrld/me/other'
+
+    with pytest.raises(AppMakerException, match='app_name -> author -> app_name'):
+        settings.update({'app_name': '{{ author }}', 'author': '{{ app_name }}'})
+
+    # Left intact on errors.
+    assert settings.raw['app_name'] == 'other'
+    assert settings['url'] == 'https://some.wrld/me/other'
+    settings['app_name'] = 'dummy'
+    assert settings['url'] == 'https://some.wrld/me/dummy'
+
+    # Self-reference extends the previous value.
+    settings['author'] = '{{ author }} and {{ app_name }}'
+    assert settings['author'] == 'me and dummy'
+    settings['app_name'] = 'other'
+    assert settings['url'] == 'https://some.wrld/me and other/other'
+
+
+def test_tpl_pack(tmp_path_factory, get_appmaker, assert_content, monkeypatch):
+
+    template = tmp_path_factory.mktemp('templates') / 'cool'
+    (template / 'src' / '__package_name__').mkdir(parents=True)
+    (template / 'makeappconf.py').write_text(
+        'from makeapp.appconfig import Config\n\n'
+        'class CoolConfig(Config):\n'
+        "    parent_template = ['click']\n\n"
+        'makeapp_config = CoolConfig\n'
+    )
+    (template / 'pyproject.toml').write_text(
+        '{% extends parent_template %}\n'
+        "{% block entry_points_custom %}{{ super() }}# cool {{ package_name }}{% endblock %}")
+    (template / 'src' / '__package_name__' / 'cool.sh').write_text('echo {{ package_name }}\n')
+    (template / 'src' / '__package_name__' / 'cool.sh').chmod(0o755)
+
+    environment = Environment(**Renderer.env_options)
+    pack_path = TemplatePack.create(template, template.parent / 'cool.mapack', environment=environment)
+    pack = TemplatePack(pack_path)
+    assert pack.name == 'cool'
+    assert list(pack.files) == ['pyproject.toml', 'src/__package_name__/cool.sh']
+    assert pack.get_source('src/__package_name__/cool.sh') == 'echo {{ package_name }}\n'
+    pack.close()
+
+    compiled = []
+    compile_orig = Environment.compile
+
+    def compile_(self, source, name=None, filename=None, **kwargs):
+        compiled.append(name)
+        return compile_orig(self, source, name, filename, **kwargs)
+
+    monkeypatch.setattr(Environment, 'compile', compile_)
+
+    def check():
+        compiled.clear()
+        target = tmp_path_factory.mktemp('app')
+        monkeypatch.chdir(target)
+        app_maker = get_appmaker(templates=[f'{pack_path}'])
+
+        assert [app_template.name for app_template in app_maker.app_templates] == [
+            '__default__', 'console', 'click', 'cool']
+        assert_content(target / 'pyproject.toml', ['"click"', '# cool dummy'])
+        script = target / 'src' / 'dummy' / 'cool.sh'
+        assert script.read_text() == 'echo dummy\n\n'
+        assert script.stat().st_mode & 0o777 == 0o755
+
+    # No directory walking and no compilation.
+    shutil.rmtree(template)
+    check()
+    assert 'click/pyproject.toml' in compiled
+    assert not [name for name in compiled if name.startswith('cool/')]
+
+    # Falls back to sources on version mismatch.
+    monkeypatch.setattr('makeapp.apptemplate.jinja2.__version__', '0.0.1')
+    check()
+    assert 'cool/pyproject.toml' in compiled
+
+    bogus = template.parent / 'bogus.mapack'
+    bogus.write_text('bogus')
+
+    with pytest.raises(AppMakerException, match='Not a template pack'):
+        get_appmaker(templates=[f'{bogus}'], rollout=False)
+
+
+def test_tpl_git(tmp_path_factory, get_appmaker, assert_content, monkeypatch):
+
+    monkeypatch.setenv('HOME', f'{tmp_path_factory.mktemp("home")}')
+
+    for role in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{role}_NAME', 'The Librarian')
+        monkeypatch.setenv(f'GIT_{role}_EMAIL', 'librarian@discworld.wrld')
+
+    source = GitTemplateSource('git+ssh://git@example.com/some/templates.git@v1.0#stack/cool/')
+    assert source.url == 'ssh://git@example.com/some/templates.git'
+    assert (source.rev, source.subdir, source.name) == ('v1.0', 'stack/cool', 'templates')
+    assert f'{source}' == 'ssh://git@example.com/some/templates.git@v1.0#stack/cool'
+
+    # scp-like addresses.
+    source = GitTemplateSource('git+git@github.com:org/repo.git')
+    assert (source.url, source.rev, source.name) == ('git@github.com:org/repo.git', '', 'repo')
+
+    source = GitTemplateSource('git+git@github.com:org/repo.git@v1.0#cool')
+    assert (source.url, source.rev, source.subdir, source.name) == (
+        'git@github.com:org/repo.git', 'v1.0', 'cool', 'repo')
+
+    source = GitTemplateSource('git+git@example.com:repo.git@v1.0')
+    assert (source.url, source.rev, source.name) == ('git@example.com:repo.git', 'v1.0', 'repo')
+
+    # Revisions with slashes.
+    source = GitTemplateSource('git+https://example.com/org/repo.git@feature/x#cool')
+    assert (source.url, source.rev, source.subdir, source.name) == (
+        'https://example.com/org/repo.git', 'feature/x', 'cool', 'repo')
+
+    source = GitTemplateSource('git+git@github.com:org/repo.git@feature/x')
+    assert (source.url, source.rev, source.name) == ('git@github.com:org/repo.git', 'feature/x', 'repo')
+
+    work = tmp_path_factory.mktemp('work')
+    remote = tmp_path_factory.mktemp('remote') / 'templates.git'
+
+    (work / 'cool').mkdir()
+    (work / 'cool' / 'COOL.txt').write_text('{{ app_name }} is cool')
+
+    with chdir(work):
+        run_command(
+            f'git init -q -b master && git add . && git commit -q -m initial && git tag v1.0 '
+            f'&& git init -q --bare {remote} && git push -q {remote} master v1.0')
+
+    def rollout(spec: str) -> Path:
+        target = tmp_path_factory.mktemp('app')
+        monkeypatch.chdir(target)
+        get_appmaker(templates=[spec])
+        return target
+
+    spec_tag = f'git+{remote.as_uri()}@v1.0#cool'
+    spec_head = f'git+{remote.as_uri()}#cool'
+
+    assert (rollout(spec_tag) / 'COOL.txt').read_text() == 'dummy is cool'
+
+    commit = run_command(f'git --git-dir={remote} rev-parse v1.0')[0]
+    cache_dir = Path.home() / '.makeapp' / 'templates'
+    assert (cache_dir / commit / 'templates' / 'cool' / 'COOL.txt').exists()
+
+    # Moving head.
+    with chdir(work):
+        (work / 'cool' / 'COOL.txt').write_text('{{ app_name }} is cooler')
+        run_command(f'git commit -q -am next && git push -q {remote} master')
+
+    assert (rollout(spec_head) / 'COOL.txt').read_text() == 'dummy is cooler'
+
+    # No remote access required for cached revisions.
+    remote.rename(remote.with_name('gone.git'))
+
+    assert (rollout(spec_tag) / 'COOL.txt').read_text() == 'dummy is cool'
+    assert (rollout(spec_head) / 'COOL.txt').read_text() == 'dummy is cooler'
+    assert (rollout(f'git+{remote.as_uri()}@{commit}#cool') / 'COOL.txt').read_text() == 'dummy is cool'
+
+    with pytest.raises(CommandError):
+        rollout(f'git+{remote.as_uri()}@v2.0#cool')
+
+    with pytest.raises(AppMakerException, match=r'No .+ directory'):
+        rollout(f'git+{remote.as_uri()}@v1.0#hot')
+
+
+def test_inheritance_map(in_tmp_path, get_appmaker, monkeypatch):
+
+    app_maker = get_appmaker(templates=['click'], rollout=False)
+    template_files = app_maker._get_template_files()
+
+    assert template_files['pyproject.toml'].parent_paths == ['console/pyproject.toml', '__default__/pyproject.toml']
+    assert template_files['README.md'].parent_paths == []
+
+    for template_file in template_files.values():
+        # Same as computed walking templates chain.
+        walked = TemplateFile(template_file.template, template_file.path_full, template_file.path_rel)
+        assert template_file.parent_paths == walked.parent_paths
+
+    def has_file(*args):
+        raise AssertionError('Unexpected file lookup')
+
+    monkeypatch.setattr(AppTemplate, 'has_file', has_file)
+    app_maker.rollout('.', overwrite=True)
+    assert '"click"' in (in_tmp_path / 'pyproject.toml').read_text()
+
+
+def test_parent_templates_cache(in_tmp_path, get_appmaker, monkeypatch):
+
+    app_maker = get_appmaker(templates=['click'], rollout=False)
+    template_file = app_maker._get_template_files()['pyproject.toml']
+
+    compiled = []
+    compile_orig = Environment.compile
+
+    def compile_(self, source, name=None, filename=None, **kwargs):
+        compiled.append(name)
+        return compile_orig(self, source, name, filename, **kwargs)
+
+    monkeypatch.setattr(Environment, 'compile', compile_)
+
+    renderer = app_maker.renderer
+    rendered = renderer.render(template_file)
+    assert '"click"' in rendered
+    assert compiled == ['click/pyproject.toml', 'console/pyproject.toml', '__default__/pyproject.toml']
+
+    # Compiled parents are reused, while every render gets its own parents chain.
+    compiled.clear()
+    assert renderer.render(template_file) == rendered
+    assert compiled == []
+
+
+def test_templates_graph(tmp_path, get_appmaker, monkeypatch):
+
+    def make(name: str, *parents: str):
+        path = tmp_path / name
+        path.mkdir()
+        (path / f'{name}.txt').write_text(name)
+
+        if parents:
+            (path / 'makeappconf.py').write_text(
+                'from makeapp.appconfig import Config\n\n'
+                'class MyConfig(Config):\n'
+                f'    parent_template = {[f"{tmp_path / parent}" for parent in parents]}\n\n'
+                'makeapp_config = MyConfig\n'
+            )
+
+        return f'{path}'
+
+    make('shared')
+    make('a', 'shared')
+    make('b', 'shared')
+    make('c', 'a', 'b')
+
+    loaded = []
+    load = AppTemplate.load
+
+    def load_(maker, template):
+        loaded.append(template.rpartition('/')[2])
+        return load(maker, template)
+
+    monkeypatch.setattr(AppTemplate, 'load', load_)
+
+    def get_names(*templates: str) -> list[str]:
+        loaded.clear()
+        app_maker = get_appmaker(templates=[f'{tmp_path / name}' for name in templates], rollout=False)
+        names = [app_template.name for app_template in app_maker.app_templates]
+        # Chained for files inheritance.
+        assert [getattr(app_template.parent, 'name', None) for app_template in app_maker.app_templates] == [
+            None, *names[:-1]]
+        return names
+
+    assert get_names('a', 'b') == ['__default__', 'shared', 'a', 'b']
+    assert sorted(loaded) == ['__default__', 'a', 'b', 'shared']  # Shared parent is loaded once.
+
+    assert get_names('c') == ['__default__', 'shared', 'a', 'b', 'c']
+    assert get_names('b', 'a') == ['__default__', 'shared', 'b', 'a']
+    assert get_names('shared', 'c') == ['__default__', 'shared', 'a', 'b', 'c']
+
+    make('p', 'a', 'b')
+    make('q', 'b', 'a')
+
+    with pytest.raises(AppMakerException, match='Inconsistent templates hierarchy'):
+        get_names('p', 'q')
+
+    make('x', 'y')
+    make('y', 'x')
+
+    with pytest.raises(AppMakerException, match='Circular templates reference: x -> y -> x'):
+        get_names('x')
+
+
+def test_config_modules_cache(tmp_path, get_appmaker):
+
+    template = tmp_path / 'cached'
+    template.mkdir()
+    executions = tmp_path / 'executions.txt'
+    config = template / 'makeappconf.py'
+    config.write_text(
+        'from pathlib import Path\n'
+        'from makeapp.appconfig import Config\n\n'
+        f'with Path({f"{executions}"!r}).open("a") as f:\n'
+        '    f.write("x")\n\n'
+        'class CachedConfig(Config):\n'
+        "    parent_template = ['console']\n\n"
+        'makeapp_config = CachedConfig\n'
+    )
+
+    def get_config():
+        app_maker = get_appmaker(templates=[f'{template}'], rollout=False)
+        return app_maker.app_templates[-1].config
+
+    config_1 = get_config()
+    config_2 = get_config()
+
+    assert executions.read_text() == 'x'
+    assert config_1 is not config_2
+    assert config_1.__class__ is config_2.__class__
+    assert sys.modules['makeapp.config.cached'].makeapp_config is config_1.__class__
+
+    # Changed config is reloaded.
+    config.write_text(config.read_text().replace('CachedConfig', 'CachedConfig2'))
+    assert get_config().__class__.__name__ == 'CachedConfig2'
+    assert executions.read_text() == 'xx'
+
+
+def test_hooks_scheduler(tmp_path, in_tmp_path, get_appmaker, monkeypatch):
+
+    log = tmp_path / 'hooks.log'
+
+    # Hooks of p1 and p2 can only pass the barrier if run concurrently.
+    sync = ModuleType('hooks_sync')
+    sync.barrier = Barrier(2, timeout=5)
+    monkeypatch.setitem(sys.modules, 'hooks_sync', sync)
+
+    def make(name: str, *, parallel: bool = True, deps: list[str] | None = None, fail: bool = False):
+        path = tmp_path / name
+        path.mkdir()
+        (path / 'makeappconf.py').write_text(
+            'from pathlib import Path\n'
+            'from time import perf_counter\n'
+            'import hooks_sync\n'
+            'from makeapp.appconfig import Config\n'
+            'from makeapp.exceptions import AppMakerException\n\n'
+            'class MyConfig(Config):\n'
+            f"    hooks_parallel = {({'rollout_post'} if parallel else set())!r}\n"
+            f"    hooks_deps = {{'rollout_post': {deps or []!r}}}\n\n"
+            '    def hook_rollout_post(self):\n'
+            f'        log = Path({f"{log}"!r})\n'
+            f"        with log.open('a') as f: f.write(f'+{name} {{perf_counter()}}\\n')\n"
+            f"        if {name!r} in ('p1', 'p2'): hooks_sync.barrier.wait()\n"
+            f'        if {fail}: raise AppMakerException("{name} failed")\n'
+            f"        with log.open('a') as f: f.write(f'-{name} {{perf_counter()}}\\n')\n\n"
+            'makeapp_config = MyConfig\n'
+        )
+        return f'{path}'
+
+    templates = [make('p1'), make('p2'), make('p3', deps=['p1', 'unknown']), make('s', parallel=False)]
+
+    app_maker = get_appmaker(templates=templates)
+
+    events = [line.split() for line in log.read_text().splitlines()]
+    timings = {event: float(timing) for event, timing in events}
+    events = [event for event, _ in events]
+
+    assert timings['+p2'] < timings['-p1']  # Concurrently.
+    assert timings['+p1'] < timings['-p2']
+    assert timings['-p1'] <= timings['+p3']  # Dependency.
+    assert events[-2:] == ['+s', '-s']  # Exclusive.
+    assert timings['-p3'] <= timings['+s']
+
+    durations = app_maker.hooks_durations
+    assert durations['rollout_post:p1'] >= timings['-p1'] - timings['+p1']
+    assert durations['rollout_post:s'] >= timings['-s'] - timings['+s']
+    assert 'rollout_post:__default__' in durations
+
+    make('bogus', fail=True)
+
+    with pytest.raises(AppMakerException, match='bogus failed'):
+        get_appmaker(templates=[*templates, f'{tmp_path / "bogus"}'])
+
+    # Parallel hook depending on a later exclusive one.
+    with pytest.raises(TaskError, match='Circular'):
+        get_appmaker(templates=[make('pc', deps=['sx']), make('sx', parallel=False)])
+
+
+def test_rollout_staged(tmp_path, in_tmp_path, get_appmaker, monkeypatch):
+
+    app_maker = get_appmaker(rollout=False)
+
+    # Fresh directory: staging directory is swapped into place.
+    dest = tmp_path / 'staged'
+    app_maker.rollout(f'{dest}', staged=True)
+
+    assert (dest / 'LICENSE').exists()
+    assert (dest / 'src' / 'dummy' / '__init__.py').exists()
+    assert [path.name for path in tmp_path.iterdir() if '.stage_' in path.name] == []
+
+    # Existing directory: files are moved into place one by one.
+    (in_tmp_path / 'README.md').write_text('mine')
+    app_maker.rollout('.', staged=True)
+
+    assert (in_tmp_path / 'README.md').read_text() == 'mine'
+    assert (in_tmp_path / 'pyproject.toml').exists()
+
+    app_maker.rollout('.', overwrite=True, staged=True)
+    assert (in_tmp_path / 'README.md').read_text() != 'mine'
+
+    # Failure: nothing is written.
+    def fail(*args, **kwargs):
+        raise AppMakerException('rendering failed')
+
+    monkeypatch.setattr(app_maker.renderer, 'render', fail)
+
+    dest = tmp_path / 'failed'
+
+    with pytest.raises(AppMakerException):
+        app_maker.rollout(f'{dest}', staged=True)
+
+    assert list(dest.iterdir()) == []
+    assert [path.name for path in tmp_path.iterdir() if '.stage_' in path.name] == []
+
+
+def test_render_cache(tmp_path, in_tmp_path, get_appmaker, monkeypatch):
+
+    rendered = []
+    render_orig = Template.render
+
+    def render(self, *args, **kwargs):
+        rendered.append(self.name)
+        return render_orig(self, *args, **kwargs)
+
+    monkeypatch.setattr(Template, 'render', render)
+
+    def get_files():
+        app_maker = get_appmaker(rollout=False)
+        return app_maker.renderer, app_maker._get_template_files()
+
+    renderer, files = get_files()
+    readme = renderer.render(files['README.md'])
+    pyproject = renderer.render(files['pyproject.toml'])
+    assert rendered == ['__default__/README.md', '__default__/pyproject.toml']
+
+    # Hits skip rendering, even in another process (renderer).
+    rendered.clear()
+    renderer, files = get_files()
+    assert renderer.render(files['README.md']) == readme
+    assert renderer.render(files['pyproject.toml']) == pyproject
+    assert rendered == []
+    assert renderer.cache.hits == 2
+
+    # Referenced setting changed.
+    renderer.context_mutator._context['description'] = 'changed'
+    assert 'changed' in renderer.render(files['README.md'])
+    assert rendered == ['__default__/README.md']
+
+    # Corrupted entries are misses.
+    for path in renderer.cache.path.glob('*.json'):
+        path.write_text('{broken')
+
+    renderer, files = get_files()
+    assert renderer.render(files['README.md']) == readme
+    assert renderer.cache.get_variables('unknown') == (False, None)
+
+    # LRU eviction.
+    cache = RenderCache(tmp_path / 'lru', max_size=100)
+
+    for idx in range(3):
+        cache.set(f'{idx}', 'x' * 30)
+        os.utime(cache.path / f'{idx}.txt', ns=(idx, idx))
+
+    assert cache.get('0') == 'x' * 30  # Recently used now.
+    cache.set('3', 'x' * 30)
+
+    assert cache.get('1') is None
+    assert cache.get('2') is None
+    assert cache.get('0')
+    assert cache.get('3')
+    assert cache.count == 2
+
+    assert cache.clear() == 60
+    assert cache.size == 0
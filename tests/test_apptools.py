@@ -1,7 +1,14 @@
+import logging
+import os
 from textwrap import dedent
 
-from makeapp.apptools import ChangelogData, Project
+import pytest
+
+from makeapp import utils
+from makeapp.apptools import ChangelogData, ChangelogIndex, Project, ProjectSnapshot
+from makeapp.exceptions import ProjectorExeption
 from makeapp.helpers.vcs import VcsHelper
+from makeapp.utils import run_command
 
 
 def test_git(in_tmp_path, get_appmaker, assert_content, monkeypatch):
@@ -40,12 +47,49 @@ def test_git(in_tmp_path, get_appmaker, assert_content, monkeypatch):
     monkeypatch.setattr('makeapp.utils.Popen.communicate', dummy_communicate)
     project.publish()
 
-    assert issued_commands == [
-        'git push',
-        'git push --tags',
-        'uv build',
-        'uv publish'
-    ]
+    # Push and build are run concurrently.
+    assert sorted(issued_commands[:2]) == ['git push --atomic --follow-tags', 'uv build']
+    assert issued_commands[2:] == ['uv publish']
+
+
+def test_git_batched(in_tmp_path, tmp_path_factory, get_appmaker, monkeypatch):
+
+    get_appmaker()
+
+    remote = tmp_path_factory.mktemp('remote')
+    run_command(f'git init -q --bare {remote} && git remote set-url origin {remote}')
+    run_command('git commit -q -m initial && git push -q -u origin master')
+
+    issued_commands = []
+    popen = utils.Popen
+
+    def popen_counted(command, *args, **kwargs):
+        issued_commands.append(command)
+        return popen(command, *args, **kwargs)
+
+    monkeypatch.setattr('makeapp.utils.Popen', popen_counted)
+    monkeypatch.setattr('makeapp.apptools.DistHelper.build', lambda: None)
+    monkeypatch.setattr('makeapp.apptools.DistHelper.publish', lambda: None)
+
+    (in_tmp_path / 'README.md').write_text('changed')
+
+    def count(func, *args, **kwargs):
+        issued_commands.clear()
+        func(*args, **kwargs)
+        return len(issued_commands)
+
+    project = Project()
+    assert count(project.add_change, ["+ it's 'quoted'"]) == 1
+    assert run_command('git status --porcelain') == []
+    assert run_command('git log -1 --format=%s') == ["it's 'quoted'"]
+
+    project = Project()
+    version, summary = project.get_release_info()
+    assert count(project.release, version, summary) == 2
+    assert count(project.publish) == 1
+
+    assert run_command(f'git -C {remote} tag') == ['v0.1.0']
+    assert run_command(f'git -C {remote} log -1 --format=%s master') == ['Release v0.1.0']
 
 
 def test_venv(in_tmp_path, get_appmaker, assert_content):
@@ -108,3 +152,190 @@ def test_changelog(in_tmp_path):
     assert data.deduce_version_increment() == 'minor'
 
     assert data.get_version_summary() == '* ++ Some feature'
+
+
+def test_changelog_head_only(in_tmp_path):
+
+    fchangelog = (in_tmp_path / ChangelogData.filename)
+    tail = ''.join(f'### v0.0.{idx} [2020-01-01]\n* ** Change {idx}.\n\n' for idx in range(5000, 0, -1))
+    fchangelog.write_text(f'# changelog\n\n\n### Unreleased\n* ++ Feature.\n\n{tail}')
+
+    data = ChangelogData.get()
+    assert data.file_helper.contents == ['# changelog', '', '', '### Unreleased', '* ++ Feature.', '']
+
+    # In place: head size is the same.
+    data.file_helper.line_replace('* ++ Feature!', offset=1)
+    data.file_helper.write()
+    assert fchangelog.read_text() == f'# changelog\n\n\n### Unreleased\n* ++ Feature!\n\n{tail}'
+
+    # Splice.
+    data = ChangelogData.get()
+    data.add_change('Some fix')
+    data.version_bump((1, 0, 0))
+    data.write()
+
+    contents = fchangelog.read_text()
+    assert contents.startswith('# changelog\n\n\n### v1.0.0 [')
+    assert contents.endswith(f'* ++ Feature!\n* ** Some fix\n\n{tail}')
+
+    data = ChangelogData.get()
+    assert data.file_helper.contents[3:5] == ['### Unreleased', '']
+    assert len(data.file_helper.contents) == 9
+
+
+def test_changelog_index(in_tmp_path):
+
+    fchangelog = (in_tmp_path / ChangelogData.filename)
+    fchangelog.write_text(dedent("""\
+    # changelog
+
+
+    ### Unreleased
+    * ++ Feature.
+
+    ### v1.1.0 [2024-02-01]
+    * !! Important.
+    * ** Fix one
+      continued.
+    * ++ Add.
+
+    ### v1.0.0 [2024-01-01]
+    * ++ Basic functionality.
+
+
+    v0.9.0 [2023-05-19]
+    -------------------
+    - Removed.
+    """))
+
+    index = ChangelogIndex.get()
+    assert [section.version for section in index.sections] == ['Unreleased', 'v1.1.0', 'v1.0.0', 'v0.9.0']
+
+    section = index.get_section('1.1.0')
+    assert section.date == '2024-02-01'
+    assert (section.line_start, section.line_end) == (6, 12)
+    assert section.entries == {'!': ['Important.'], '*': ['Fix one continued.'], '+': ['Add.']}
+    assert index.get_section('v0.9.0').entries == {'-': ['Removed.']}
+
+    assert [section.version for section in index.get_since('v1.0.0')] == ['Unreleased', 'v1.1.0']
+
+    with pytest.raises(ProjectorExeption, match='not found'):
+        index.get_section('v3.0.0')
+
+    # In-process cache.
+    assert ChangelogIndex.get() is index
+
+    # On-disk cache.
+    ChangelogIndex._cache.clear()
+    assert (in_tmp_path / '.makeapp' / ChangelogIndex.cache_filename).exists()
+    index_cached = ChangelogIndex.get()
+    assert index_cached is not index
+    assert index_cached.get_section('v1.1.0').as_dict() == section.as_dict()
+
+    # Invalidation.
+    fchangelog.write_text(fchangelog.read_text().replace('Feature.', 'Feature!'))
+    sections = Project(in_tmp_path).get_changelog_sections()
+    assert str(sections[0]) == '### Unreleased\n* ++ Feature!'
+
+
+def test_monorepo(in_tmp_path, monkeypatch):
+
+    for name, version, change in (('liba', '1.0.0', '++ Add'), ('libb', '0.1.0', '** Fix'), ('libc', '0.1.0', '')):
+        path = in_tmp_path / 'libs' / name
+        (path / 'src' / name).mkdir(parents=True)
+        (path / 'src' / name / '__init__.py').write_text(f"VERSION = '{version}'\n")
+        (path / 'pyproject.toml').write_text('')
+        (path / ChangelogData.filename).write_text(
+            f'# changelog\n\n\n### Unreleased\n{f"* {change}." if change else ""}\n\n### v{version}\n* ++ Basic.\n')
+
+    (in_tmp_path / '.gitignore').write_text('.makeapp/\n')
+    run_command('git init -q -b master && git add . && git commit -q -m initial')
+
+    project = Project(log_level=logging.DEBUG)
+    assert [member.name for member in project.get_members()] == ['liba', 'libb', 'libc']
+    assert logging.getLogger('makeapp.apptools').level == logging.DEBUG
+
+    releases = project.get_release_info_all()
+    assert {member.name: info for member, info in releases.items()} == {
+        'liba': ('v1.1.0', '* ++ Add.'),
+        'libb': ('v0.1.1', '* ** Fix.'),
+    }
+
+    project.release_all(releases)
+
+    assert run_command('git log --format=%s') == ['Release liba v1.1.0, libb v0.1.1', 'initial']
+    assert run_command('git tag') == ['liba-v1.1.0', 'libb-v0.1.1']
+    assert run_command('git status --porcelain') == []
+    assert "VERSION = '1.1.0'" in (in_tmp_path / 'libs/liba/src/liba/__init__.py').read_text()
+
+    issued_commands = []
+
+    def dummy_communicate(self, *args, **kwargs):
+        issued_commands.append(self.args)
+        return b'', b''
+
+    monkeypatch.setattr('makeapp.utils.Popen.communicate', dummy_communicate)
+    project.publish_all(list(releases))
+
+    libs = in_tmp_path / 'libs'
+    push = 'git push --atomic --follow-tags'
+    build_a = f'uv build {libs}/liba --out-dir {libs}/liba/dist'
+    upload_a = f'uv publish {libs}/liba/dist/*'
+
+    assert sorted(issued_commands) == sorted([
+        push,
+        build_a,
+        f'uv build {libs}/libb --out-dir {libs}/libb/dist',
+        upload_a,
+        f'uv publish {libs}/libb/dist/*',
+    ])
+    assert issued_commands.index(upload_a) > max(issued_commands.index(push), issued_commands.index(build_a))
+
+
+def test_snapshot(in_tmp_path, get_appmaker, monkeypatch):
+
+    get_appmaker()
+
+    changelog = in_tmp_path / 'CHANGELOG.md'
+    changelog.write_text(f'{changelog.read_text()}\n### v0.0.1\n* ** Old.\n')
+
+    def age(*paths):
+        for path in paths:
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns - 10 ** 10))
+
+    (in_tmp_path / '.makeapp').mkdir()
+    age(in_tmp_path / 'src/dummy/__init__.py', in_tmp_path / 'CHANGELOG.md')
+
+    project = Project()
+    project.add_change('+ Some')
+
+    # Head size is known for the file we've just written ourselves.
+    head_size = changelog.read_text().index('* ++ Some.\n') + len('* ++ Some.\n\n')
+    snapshot = ProjectSnapshot(in_tmp_path).data
+    assert snapshot['package']['value'] == 'src/dummy'
+    assert snapshot['version_line']['value'] == 2
+    assert snapshot['changelog_head']['value'] == head_size
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Discovery is not expected')
+
+    monkeypatch.setattr(Project, 'find_packages', fail)
+    monkeypatch.setattr(ChangelogData, '_read_head', fail)
+
+    # Subsequent changes reuse the head.
+    Project().add_change('+ Other')
+    assert ProjectSnapshot(in_tmp_path).data['changelog_head']['value'] == head_size + len('* ++ Other.\n')
+
+    project = Project()
+    project._gather_data()
+    assert project.package.version_current == (0, 0, 0)
+    assert project.changelog.get_changes() == ['* ++ Basic functionality.', '* ++ Other.', '* ++ Some.']
+
+    # Changed files are not trusted.
+    (in_tmp_path / 'CHANGELOG.md').write_text('# changelog\n\n### v1.0.0\n* ++ Some.\n\n### v0.1.0\n* ++ Basic.\n')
+    monkeypatch.undo()
+
+    project = Project()
+    project._gather_data()
+    assert project.changelog.get_changes() == []
+    assert project.changelog.file_helper.contents[:4] == ['# changelog', '', '### Unreleased', '']
@@ -1,9 +1,11 @@
+import json
 import logging
 
 import pytest
 from click.testing import CliRunner
 
 from makeapp.cli import entry_point
+from makeapp.rendering import RenderCache
 
 
 @pytest.fixture
@@ -32,3 +34,55 @@ def test_smallcycle(in_tmp_path, run_command, caplog):
     assert 'Running tests' in caplog.text
     assert "Tests OK" in result.output
     assert result.exit_code == 0
+
+
+def test_changelog_show(in_tmp_path, run_command):
+
+    (in_tmp_path / 'CHANGELOG.md').write_text(
+        '# changelog\n\n\n### v1.1.0 [2024-02-01]\n* ++ Add.\n\n### v1.0.0 [2024-01-01]\n* ** Fix.\n')
+
+    result = run_command(['changelog', 'show', '--json', '--since', '1.0.0'])
+    assert result.exit_code == 0
+    assert json.loads(result.output)[0]['entries'] == {'+': ['Add.']}
+
+    result = run_command(['changelog', 'show', 'v1.0.0'])
+    assert result.output == '### v1.0.0 [2024-01-01]\n* ** Fix.\n'
+
+
+def test_names_check(tmp_path, run_command, monkeypatch):
+
+    monkeypatch.setenv('HOME', f'{tmp_path}')
+
+    (tmp_path / 'index.html').write_text('<a href="/simple/django/">Django</a>\n')
+    candidates = tmp_path / 'candidates.txt'
+    candidates.write_text('# services\ndjango\n\nx7t8whatsthat\n')
+
+    result = run_command(['names', 'check', f'{candidates}', '-i', f'{tmp_path}'])
+    assert result.exit_code == 0
+    assert result.output == 'django: in use\nx7t8whatsthat: available\n'
+    assert list((tmp_path / '.makeapp' / 'cache').glob('index_*.names'))
+
+
+def test_templates_pack(in_tmp_path, run_command):
+
+    template = in_tmp_path / 'cool'
+    template.mkdir()
+    (template / 'COOL.txt').write_text('{{ app_name }}')
+
+    result = run_command(['templates', 'pack', f'{template}', '-o', 'my.mapack'])
+    assert result.exit_code == 0
+    assert (in_tmp_path / 'my.mapack').exists()
+
+
+def test_cache(run_command):
+
+    cache = RenderCache()
+    cache.set('some', 'rendered')
+
+    result = run_command(['cache', 'show'])
+    assert result.exit_code == 0
+    assert 'Entries: 1' in result.output
+
+    result = run_command(['cache', 'clear'])
+    assert result.exit_code == 0
+    assert cache.count == 0
@@ -0,0 +1,68 @@
+import pytest
+
+from makeapp.appmaker import AppMaker
+from makeapp.apptools import Project
+from makeapp.events import EVENTS, Event, FileRendered, HookFinished, SubprocessFinished, VcsOp
+from makeapp.utils import run_command
+
+
+def test_events(in_tmp_path, get_appmaker, monkeypatch):
+
+    assert AppMaker.events is EVENTS
+    assert Project.events is EVENTS
+    assert not EVENTS
+
+    events = []
+    rendered = []
+
+    def failing(event: Event):
+        raise ValueError('should not break emitters')
+
+    with EVENTS.listening(events.append), EVENTS.listening(rendered.append, FileRendered):
+        unsubscribe = EVENTS.subscribe(failing)
+        get_appmaker()
+        unsubscribe()
+
+    assert not EVENTS
+
+    names = {event.name for event in events}
+    assert names >= {
+        'template_loaded',
+        'hook_started',
+        'hook_finished',
+        'file_rendered',
+        'subprocess_started',
+        'subprocess_finished',
+        'vcs_op',
+    }
+
+    assert rendered
+    assert all(isinstance(event, FileRendered) for event in rendered)
+
+    readme = next(event for event in rendered if event.template == '__default__/README.md')
+    assert readme.size > 0
+    assert readme.duration >= 0
+    assert not readme.cached
+
+    hook = next(event for event in events if isinstance(event, HookFinished))
+    assert hook.template == '__default__'
+    assert hook.error is None
+
+    assert any(event.command == 'init -q' and event.vcs == 'git' for event in events if isinstance(event, VcsOp))
+    assert all(event.returncode == 0 for event in events if isinstance(event, SubprocessFinished))
+
+    assert readme.as_dict()['event'] == 'file_rendered'
+
+    # Start and finish are paired even on failures.
+    def fail(*args, **kwargs):
+        raise OSError('no shell')
+
+    monkeypatch.setattr('makeapp.utils.Popen', fail)
+    events.clear()
+
+    with EVENTS.listening(events.append), pytest.raises(OSError, match='no shell'):
+        run_command('echo 1')
+
+    assert [event.name for event in events] == ['subprocess_started', 'subprocess_finished']
+    assert events[1].returncode is None
+    assert 'FileRendered(cached=False' in repr(readme)
@@ -0,0 +1,47 @@
+from makeapp.apptools import ChangelogData
+from makeapp.fleet import Fleet, FleetResult
+from makeapp.utils import run_command
+
+
+def test_fleet(in_tmp_path):
+
+    repos = []
+
+    for name in ('one', 'two', 'three'):
+        path = in_tmp_path / name
+        (path / name).mkdir(parents=True)
+        (path / name / '__init__.py').write_text("VERSION = '1.0.0'\n")
+        (path / 'pyproject.toml').write_text('')
+        (path / ChangelogData.filename).write_text('# changelog\n\n\n### Unreleased\n\n### v1.0.0\n* ++ Basic.\n')
+        run_command(f'cd {path} && git init -q -b master && git add . && git commit -q -m initial')
+        repos.append(path)
+
+    repos.insert(1, in_tmp_path / 'bogus')
+
+    fpath = in_tmp_path / 'repos.txt'
+    paths = '\n'.join(map(str, repos))
+    fpath.write_text(f'# repos\n\n{paths}\n')
+    assert Fleet.read_repos(fpath) == repos
+
+    reported = []
+    fleet = Fleet(repos, jobs=2, log_dir=in_tmp_path / 'logs')
+    results = fleet.run('change', ('+ Fleet change',), on_result=reported.append)
+
+    assert len(reported) == 4
+    assert [result.status for result in results] == ['ok', 'failed', 'ok', 'ok']
+    assert 'bogus' in results[1].error
+    assert results[0].log_path.exists()
+
+    for repo in (repos[0], repos[2], repos[3]):
+        assert '* ++ Fleet change.' in (repo / ChangelogData.filename).read_text()
+        assert run_command(f'cd {repo} && git log -1 --format=%s') == ['Fleet change']
+
+    report = Fleet.get_report(results, duration=1)
+    assert 'Repositories: 4 (ok: 3, failed: 1)' in report
+    assert f'{repos[1]}: failed' in report
+
+    # Fail fast: nothing is started after the first failure.
+    results = Fleet(repos[1:] * 3, jobs=1, log_dir=in_tmp_path / 'logs').run('change', ('x',), fail_fast=True)
+    statuses = [result.status for result in results]
+    assert statuses[0] == FleetResult.STATUS_FAIL
+    assert FleetResult.STATUS_SKIP in statuses
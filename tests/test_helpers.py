@@ -1,9 +1,86 @@
 from makeapp.helpers.dist import DistHelper
 from makeapp.helpers.tests import TestsHelper
+from makeapp.helpers.vcs import GitHelper, GitRepository
+from makeapp.utils import run_command
 
 
-def test_disthelper():
-    assert DistHelper
+def test_disthelper(in_tmp_path, monkeypatch):
+
+    builds = []
+
+    def build(command, **kwargs):
+        builds.append(command)
+        dist_dir = DistHelper.get_dist_dir()
+        dist_dir.mkdir()
+        (dist_dir / 'dummy-0.1.0.tar.gz').write_text('sdist')
+        (dist_dir / 'dummy-0.1.0-py3-none-any.whl').write_text('wheel')
+
+    monkeypatch.setattr(DistHelper, 'run_command_uv', build)
+
+    (in_tmp_path / 'pyproject.toml').write_text('[build-system]\nbuild-backend = "hatchling.build"\n')
+    (in_tmp_path / 'src').mkdir()
+    (in_tmp_path / 'src' / 'module.py').write_text('VERSION = "0.1.0"')
+
+    artifacts = DistHelper.build()
+    assert [artifact.name for artifact in artifacts] == ['dummy-0.1.0-py3-none-any.whl', 'dummy-0.1.0.tar.gz']
+    assert len(builds) == 1
+
+    # Cache hit.
+    assert DistHelper.build() == artifacts
+    assert len(builds) == 1
+
+    DistHelper.build(force=True)
+    assert len(builds) == 2
+
+    # Source changed.
+    (in_tmp_path / 'src' / 'module.py').write_text('VERSION = "0.1.1"')
+    DistHelper.build()
+    assert len(builds) == 3
+
+    # Build config changed.
+    (in_tmp_path / 'pyproject.toml').write_text('[build-system]\nbuild-backend = "other"\n')
+    DistHelper.build()
+    assert len(builds) == 4
+
+
+def test_githelper_introspection(in_tmp_path, monkeypatch):
+
+    run_command('git init -q -b master && git remote add origin some@some.com && git remote add other other@some.com')
+    run_command('git commit -q --allow-empty -m initial && git tag v1 && git pack-refs --all')
+
+    repo = GitRepository(in_tmp_path)
+    sha = run_command('git rev-parse HEAD')[0]
+    assert not (in_tmp_path / '.git/refs/heads/master').exists()  # packed
+    assert repo.resolve_ref() == sha
+    assert repo.resolve_ref('refs/tags/v1') == sha
+    assert repo.resolve_ref('refs/heads/unknown') is None
+
+    def fail(*args, **kwargs):
+        raise AssertionError('No subprocess expected')
+
+    monkeypatch.setattr('makeapp.utils.Popen', fail)
+
+    helper = GitHelper(in_tmp_path)
+    assert helper.get_branch() == 'master'
+    assert helper.get_remotes() == ['origin', 'other']
+    helper.check()
+    assert helper._cache['remotes'] is helper.get_remotes()
+
+
+def test_githelper_commit_all_modified(in_tmp_path):
+
+    run_command('git init -q -b master')
+    (in_tmp_path / 'tracked.txt').write_text('1')
+    run_command('git add tracked.txt && git commit -q -m initial')
+
+    (in_tmp_path / 'tracked.txt').write_text('2')
+    (in_tmp_path / 'CHANGELOG.md').write_text('# changelog')  # untracked yet
+    (in_tmp_path / 'other.txt').write_text('untracked')
+
+    GitHelper(in_tmp_path).commit('changes', files=['CHANGELOG.md'], all_modified=True)
+
+    assert run_command('git show --name-only --format= HEAD') == ['CHANGELOG.md', 'tracked.txt']
+    assert run_command('git status --porcelain') == ['?? other.txt']
 
 
 class TestTestsHelper:
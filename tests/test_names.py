@@ -0,0 +1,88 @@
+import pytest
+
+from makeapp.exceptions import AppMakerException
+from makeapp.names import IndexSnapshot, NameChecker, normalize_name
+
+
+def test_normalize_name():
+    assert normalize_name('Some_Cool.Name--x') == 'some-cool-name-x'
+
+
+def test_name_checker(tmp_path, index_server, monkeypatch):
+
+    registries = {
+        'One': f'{index_server.url}{{name}}/',
+        'Two': f'{index_server.url}two/{{name}}/',
+        'Down': 'http://127.0.0.1:1/{name}/',
+    }
+    checker = NameChecker(registries, cache_dir=tmp_path, timeout=2)
+
+    statuses = checker.check(['Django', 'x7t8whatsthat'])
+    assert [(status.name, status.registry, status.in_use, status.cached) for status in statuses] == [
+        ('Django', 'One', True, False),
+        ('Django', 'Two', True, False),
+        ('Django', 'Down', None, False),
+        ('x7t8whatsthat', 'One', False, False),
+        ('x7t8whatsthat', 'Two', False, False),
+        ('x7t8whatsthat', 'Down', None, False),
+    ]
+    assert str(statuses[0]) == f'Django: in use (One - {index_server.url}django/)'
+    assert {method for method, _ in index_server.requests} == {'HEAD'}
+    assert len(index_server.requests) == 4
+
+    # Cached. Unknown statuses are rechecked.
+    statuses = checker.check(['django'])
+    assert [(status.in_use, status.cached) for status in statuses] == [(True, True), (True, True), (None, False)]
+    assert len(index_server.requests) == 4
+
+    # Expired.
+    monkeypatch.setattr('makeapp.names.time', lambda: 10 ** 10)
+    statuses = checker.check(['django'])
+    assert [status.cached for status in statuses] == [False, False, False]
+    assert len(index_server.requests) == 6
+
+    # No cache.
+    checker = NameChecker(registries, cache_dir=tmp_path / 'nocache', ttl=0)
+    checker.check(['django'])
+    assert len(index_server.requests) == 8
+    assert not (tmp_path / 'nocache').exists()
+
+
+def test_index_snapshot(tmp_path, index_server):
+
+    index_server.projects = {'Django', 'some_Lib', 'zope.interface', 'a'}
+
+    snapshot = IndexSnapshot(index_server.url, cache_dir=tmp_path)
+    assert not snapshot.exists
+
+    with pytest.raises(AppMakerException):
+        assert 'a' in snapshot
+
+    assert snapshot.update() == 4
+    assert snapshot.path.read_text() == 'a\ndjango\nsome-lib\nzope-interface\n'
+    assert snapshot.meta['count'] == 4
+
+    for name in ('a', 'django', 'Some.Lib', 'zope-interface', 'ZOPE_interface'):
+        assert name in snapshot
+
+    for name in ('', 'b', 'djang', 'djangoo', 'some', 'zz', '0'):
+        assert name not in snapshot
+
+    # Local mirror.
+    mirror = tmp_path / 'mirror'
+    mirror.mkdir()
+    names = [f'name{idx}' for idx in range(0, 100000, 2)]
+    (mirror / 'index.html').write_text('\n'.join(f'<a href="/simple/{name}/">{name}</a>' for name in names))
+
+    for url in (f'{mirror}', mirror.as_uri(), f'{mirror / "index.html"}'):
+        snapshot = IndexSnapshot(url, cache_dir=tmp_path)
+        assert snapshot.update() == 50000
+        assert all(f'name{idx}' in snapshot for idx in range(0, 1000, 2))
+        assert not any(f'name{idx}' in snapshot for idx in range(1, 1000, 2))
+        snapshot.close()
+
+    # Empty index.
+    (mirror / 'index.html').write_text('')
+    snapshot = IndexSnapshot(f'{mirror}', cache_dir=tmp_path)
+    assert snapshot.update() == 0
+    assert 'a' not in snapshot
@@ -0,0 +1,85 @@
+from threading import Event
+
+import pytest
+
+from makeapp.exceptions import TaskError
+from makeapp.utils import Replacer, Task, TaskGraph, replace_infiles
+
+
+def test_task_graph():
+
+    order = []
+    started = Event()
+
+    def slow():
+        # Waits for a concurrent task.
+        assert started.wait(5)
+        order.append('slow')
+
+    def fast():
+        started.set()
+        order.append('fast')
+
+    graph = TaskGraph()
+    graph.add('final', lambda: order.append('final'), deps=['slow', 'fast'])
+    graph.add('slow', slow)
+    graph.add('fast', fast)
+
+    tasks = graph.run()
+    assert order == ['fast', 'slow', 'final']
+    assert all(task.status == Task.STATUS_OK for task in tasks.values())
+
+
+def test_task_graph_fail():
+
+    def fail():
+        raise ValueError('bogus')
+
+    graph = TaskGraph()
+    graph.add('one', fail)
+    graph.add('two', lambda: None)
+    graph.add('three', lambda: None, deps=['one'])
+    graph.add('four', lambda: None, deps=['three'])
+
+    with pytest.raises(TaskError) as e:
+        graph.run()
+
+    assert 'one: failed' in str(e.value)
+    assert 'bogus' in str(e.value)
+    assert [task.status for task in graph.tasks.values()] == ['failed', 'ok', 'skipped', 'skipped']
+
+    graph.add('one', lambda: None, deps=['four'])
+
+    with pytest.raises(TaskError, match='Circular'):
+        graph.run()
+
+
+def test_replace_infiles(tmp_path):
+
+    file_1 = tmp_path / 'one.py'
+    file_1.write_text("NAME = 'dummy'\r\nSETTINGS = 'dummy.settings'\n")
+    file_1.chmod(0o755)
+
+    file_2 = tmp_path / 'two.py'
+    file_2.write_text('nothing here\n')
+    mtime = file_2.stat().st_mtime_ns
+
+    counts = replace_infiles(
+        [file_1, file_2, f'{file_1}'],
+        {
+            'dummy': 'cool',
+            'dummy.settings': 'dummy.settings.auto',
+            'cool': 'hot',
+        })
+
+    assert counts == {file_1: 2, file_2: 0}
+
+    # Single pass: replacements are not rescanned, longer terms win. Line endings are kept.
+    assert file_1.read_bytes() == b"NAME = 'cool'\r\nSETTINGS = 'dummy.settings.auto'\n"
+    assert file_1.stat().st_mode & 0o777 == 0o755
+
+    # Untouched.
+    assert file_2.stat().st_mtime_ns == mtime
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['one.py', 'two.py']
+
+    assert Replacer({}).replace('dummy') == ('dummy', 0)